@@ -1,88 +1,536 @@
+import asyncio
+import json
+import random
+import time
 import requests
+import httpx
 import os
+from verdict_cache import VerdictCache
+from lexicon import Lexicon
+from metrics import Counter, Histogram
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
+# Overridable so benchmarks can point the validator at a local stand-in
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com")
+GEMINI_API_URL = f"{GEMINI_API_BASE}/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "8"))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "2"))
+GEMINI_BATCH_SIZE = int(os.getenv("GEMINI_BATCH_SIZE", "50"))
+# Follow-up requests for pairs a response had no usable verdict for
+GEMINI_PARSE_RETRIES = int(os.getenv("GEMINI_PARSE_RETRIES", "1"))
+# How long concurrent validations wait for each other before their pairs are sent together
+GEMINI_COALESCE_WINDOW = float(os.getenv("GEMINI_COALESCE_WINDOW", "0.005"))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
-def validate_word(category_word_pairs: list[tuple[str, str, str]]) -> dict[str, tuple[bool, str, bool]]:
+verdict_cache = VerdictCache()
+lexicon = Lexicon()
+
+VALIDATOR_SECONDS = Histogram(
+    "wordrush_validator_seconds", "Time spent in each validator stage.", ("stage",))
+VALIDATOR_PAIRS = Counter(
+    "wordrush_validator_pairs_total", "Unique pairs validated, by where the verdict came from.", ("source",))
+GEMINI_REQUESTS = Counter(
+    "wordrush_gemini_requests_total", "Gemini requests, by outcome.", ("outcome",))
+VERDICTS_PARSED = Counter(
+    "wordrush_validator_parsed_verdicts_total",
+    "Verdicts parsed from Gemini responses: ok, missing (pair sent but no usable verdict) or malformed (unusable entry).",
+    ("outcome",))
+
+
+class CircuitBreaker:
+    """
+    Stops calling Gemini after `failure_threshold` consecutive failures and
+    lets a single trial request through once `reset_timeout` seconds have passed.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "half-open":
+            # Let one trial through and keep the breaker open for everyone else
+            self.opened_at = time.monotonic()
+            return True
+        return state == "closed"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+circuit_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5")),
+    reset_timeout=float(os.getenv("GEMINI_BREAKER_RESET", "30")),
+)
+_http_session = requests.Session()
+_async_client = None
+_async_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+
+class ValidatorUnavailable(Exception):
+    """Raised when Gemini cannot be reached, or the circuit breaker is open."""
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(GEMINI_TIMEOUT),
+            limits=httpx.Limits(max_connections=GEMINI_MAX_CONCURRENCY, max_keepalive_connections=GEMINI_MAX_CONCURRENCY),
+            headers={"Content-Type": "application/json"},
+        )
+    return _async_client
+
+async def close_async_client():
+    """Close the pooled HTTP client; call on application shutdown."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+def normalize_word(word: str) -> str:
+    return " ".join(word.strip().lower().split())
+
+def _fallback_verdict(word: str) -> tuple[bool, str]:
     """
-    Validate multiple category-letter-word pairs in one API call.
-    Returns a dict mapping category to (is_valid, explanation, is_unique).
+    Local verdict used while Gemini is unavailable. Words the lexicon knows
+    never get here, and anything else is rejected: a provisional acceptance
+    would be scored, written to the leaderboard and logged like a real verdict.
     """
+    return False, "Validator unavailable and answer is not in the local word list"
+
+def _build_payload(pending: dict[str, tuple[str, str, str]]) -> dict:
+    """Request verdicts for the (category, letter, word) pairs in `pending`, keyed by pair ID."""
+    items = [{"id": pair_id, "category": category, "letter": letter, "word": word}
+             for pair_id, (category, letter, word) in pending.items()]
+    prompt = (
+        "Evaluate each category-word pair below for validity in any common context "
+        "(e.g., proper nouns, cultural references, team names): the word must be an example of the category "
+        "and start with the given letter.\n"
+        "Reply with a JSON array holding one object per pair, with the pair's \"id\", \"valid\" (true or false) "
+        "and a short \"explanation\" (max 20 words).\n"
+        f"Pairs:\n{json.dumps(items, ensure_ascii=False)}"
+    )
+    return {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generationConfig": {"responseMimeType": "application/json", "responseSchema": _RESPONSE_SCHEMA},
+    }
+
+_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {"id": {"type": "STRING"}, "valid": {"type": "BOOLEAN"}, "explanation": {"type": "STRING"}},
+        "required": ["id", "valid", "explanation"],
+    },
+}
+
+def _response_items(result: dict) -> list:
+    """The JSON array in a Gemini response body, or [] when there is none."""
+    try:
+        text = result["candidates"][0]["content"]["parts"][0]["text"].strip()
+    except (KeyError, IndexError, TypeError, AttributeError):
+        return []
+    # Tolerate a Markdown code fence around the JSON
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    try:
+        items = json.loads(text)
+    except ValueError:
+        print(f"Unparseable Gemini response: {text[:200]}")
+        return []
+    if isinstance(items, dict):
+        items = items.get("verdicts", [items])
+    return items if isinstance(items, list) else []
+
+def _parse_response(result: dict, pending: dict[str, tuple[str, str, str]]):
+    """
+    Parse a Gemini response body in one pass over its JSON array.
+    Returns the verdicts, mapping (category, word) to (is_valid, explanation),
+    and the subset of `pending` that had no well-formed verdict.
+    """
+    with VALIDATOR_SECONDS.time("parse"):
+        verdicts = {}
+        missing = dict(pending)
+        malformed = 0
+        for item in _response_items(result):
+            pair_id = str(item.get("id")) if isinstance(item, dict) else None
+            if pair_id not in missing:
+                malformed += 1
+                continue
+            valid = item.get("valid")
+            if isinstance(valid, str) and valid.lower() in ("yes", "no", "true", "false"):
+                valid = valid.lower() in ("yes", "true")
+            if not isinstance(valid, bool):
+                malformed += 1
+                continue
+            category, _, word = missing.pop(pair_id)
+            explanation = item.get("explanation")
+            explanation = explanation.strip().rstrip(".") if isinstance(explanation, str) else ""
+            verdicts[(category, word)] = (valid, explanation or "No explanation given")
+    VERDICTS_PARSED.inc("ok", amount=len(verdicts))
+    VERDICTS_PARSED.inc("missing", amount=len(missing))
+    if malformed:
+        VERDICTS_PARSED.inc("malformed", amount=malformed)
+    return verdicts, missing
+
+def _number_pairs(pairs: list[tuple[str, str, str]]) -> dict[str, tuple[str, str, str]]:
+    """Give each pair of a chunk an ID that stays the same when it is re-requested."""
+    return {str(i): pair for i, pair in enumerate(pairs, 1)}
+
+def _post_gemini(payload: dict) -> dict:
+    """One blocking Gemini request; returns the response body."""
     if not GEMINI_API_KEY:
         raise Exception("GEMINI_API_KEY not set in environment variables")
+    if not circuit_breaker.allow():
+        GEMINI_REQUESTS.inc("breaker_open")
+        raise ValidatorUnavailable("circuit breaker open")
+    try:
+        with VALIDATOR_SECONDS.time("gemini"):
+            response = _http_session.post(GEMINI_API_URL, json=payload, timeout=GEMINI_TIMEOUT)
+            response.raise_for_status()
+            result = response.json()
+    except (requests.RequestException, ValueError) as e:
+        circuit_breaker.record_failure()
+        GEMINI_REQUESTS.inc("error")
+        raise ValidatorUnavailable(str(e)) from e
+    circuit_breaker.record_success()
+    GEMINI_REQUESTS.inc("ok")
+    return result
+
+async def _post_gemini_async(payload: dict) -> dict:
+    """
+    One Gemini request without blocking the event loop; returns the response
+    body. Concurrency is bounded by a semaphore; timeouts, connection errors
+    and retryable status codes are retried with exponential backoff before the
+    failure counts against the circuit breaker.
+    """
+    if not GEMINI_API_KEY:
+        raise Exception("GEMINI_API_KEY not set in environment variables")
+    if not circuit_breaker.allow():
+        GEMINI_REQUESTS.inc("breaker_open")
+        raise ValidatorUnavailable("circuit breaker open")
+
+    client = _get_async_client()
+    last_error = None
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(min(0.25 * 2 ** (attempt - 1), 2.0) * (0.5 + random.random()))
+        try:
+            async with _async_semaphore:
+                with VALIDATOR_SECONDS.time("gemini"):
+                    response = await client.post(GEMINI_API_URL, json=payload)
+            if response.status_code in RETRY_STATUS_CODES:
+                last_error = f"HTTP {response.status_code}"
+                GEMINI_REQUESTS.inc("retryable")
+                continue
+            response.raise_for_status()
+            result = response.json()
+        except (httpx.TransportError, ValueError) as e:
+            last_error = str(e) or type(e).__name__
+            GEMINI_REQUESTS.inc("retryable")
+            continue
+        except httpx.HTTPStatusError as e:
+            last_error = str(e)
+            GEMINI_REQUESTS.inc("error")
+            break
+        circuit_breaker.record_success()
+        GEMINI_REQUESTS.inc("ok")
+        return result
+
+    circuit_breaker.record_failure()
+    raise ValidatorUnavailable(last_error)
+
+def _ask_gemini(pairs: list[tuple[str, str, str]]) -> dict[tuple[str, str], tuple[bool, str]]:
+    """
+    Send the given (category, letter, word) pairs to Gemini, blocking. Pairs
+    the response has no well-formed verdict for are re-requested on their own,
+    up to GEMINI_PARSE_RETRIES times; any still missing are left out.
+    """
+    pending = _number_pairs(pairs)
+    verdicts, pending = _parse_response(_post_gemini(_build_payload(pending)), pending)
+    for _ in range(GEMINI_PARSE_RETRIES):
+        if not pending:
+            break
+        try:
+            fresh, pending = _parse_response(_post_gemini(_build_payload(pending)), pending)
+        except ValidatorUnavailable:
+            break
+        verdicts.update(fresh)
+    return verdicts
 
-    results = {}
-    prompt_parts = []
-    words_by_category = {}
+async def _ask_gemini_async(pairs: list[tuple[str, str, str]]) -> dict[tuple[str, str], tuple[bool, str]]:
+    """Non-blocking variant of _ask_gemini."""
+    pending = _number_pairs(pairs)
+    verdicts, pending = _parse_response(await _post_gemini_async(_build_payload(pending)), pending)
+    for _ in range(GEMINI_PARSE_RETRIES):
+        if not pending:
+            break
+        try:
+            fresh, pending = _parse_response(await _post_gemini_async(_build_payload(pending)), pending)
+        except ValidatorUnavailable:
+            break
+        verdicts.update(fresh)
+    return verdicts
+
+def _check_locally(category_word_pairs):
+    """
+    Normalize and dedupe (category, letter, word) pairs, apply the
+    starting-letter check and look them up in the local lexicon.
+    Returns the verdicts known so far, keyed by (category, normalized word),
+    and the rest as a dict mapping (category, normalized word) to letter.
+    """
+    verdicts = {}
+    candidates = {}
     for category, letter, word in category_word_pairs:
         letter = letter.upper()
-        word = word.strip().lower()
+        word = normalize_word(word)
+        if (category, word) in verdicts or (category, word) in candidates:
+            continue
         if not word.startswith(letter.lower()):
-            results[category] = (False, f"'{word}' does not start with '{letter}'", True)
+            verdicts[(category, word)] = (False, f"'{word}' does not start with '{letter}'")
+        elif lexicon.contains(category, word):
+            verdicts[(category, word)] = (True, f"'{word}' is a known {category.lower()} answer")
         else:
-            prompt_parts.append(f"('{category}', '{word}') starts with '{letter}'")
-            words_by_category[category] = word
+            candidates[(category, word)] = letter
+    return verdicts, candidates
 
-    if not prompt_parts:
-        return results
+def _add_cached(verdicts, candidates, cached):
+    """Add the verdict cache's answers for the candidates; returns the (category, letter, word) misses."""
+    local = len(verdicts)
+    verdicts.update(cached)
+    misses = [(category, letter, word) for (category, word), letter in candidates.items() if (category, word) not in verdicts]
+    VALIDATOR_PAIRS.inc("local", amount=local)
+    VALIDATOR_PAIRS.inc("cache", amount=len(verdicts) - local)
+    return misses
 
-    headers = {"Content-Type": "application/json"}
-    prompt = (
-        f"Evaluate these category-word pairs for validity in any common context (e.g., proper nouns, cultural references, team names):\n"
-        f"{'; '.join(prompt_parts)}.\n"
-        f"For each, respond with 'yes' or 'no', a period, a short explanation (max 20 words), and 'unique' or 'duplicate' if the word repeats elsewhere. "
-        f"Format as: category: response; category: response."
-    )
-    payload = {"contents": [{"parts": [{"text": prompt}]}]}
+def _split_pairs(category_word_pairs):
+    """
+    Check pairs locally (see _check_locally) and then in the verdict cache.
+    Returns the verdicts known so far, keyed by (category, normalized word),
+    and the list of (category, letter, word) misses.
+    """
+    verdicts, candidates = _check_locally(category_word_pairs)
+    cached = verdict_cache.get_many(list(candidates)) if candidates else {}
+    return verdicts, _add_cached(verdicts, candidates, cached)
 
-    try:
-        response = requests.post(GEMINI_API_URL, json=payload, headers=headers)
-        response.raise_for_status()
-        result = response.json()
-
-        if "candidates" in result and result["candidates"]:
-            text_response = result["candidates"][0]["content"]["parts"][0]["text"].strip()
-            # Replace newlines with semicolons and clean up
-            text_response = text_response.replace("\n", "; ").strip()
-            print(f"Raw Gemini response: {text_response}")
-            response_lines = [line.strip() for line in text_response.split(";") if line.strip()]
-            for line in response_lines:
-                if ":" in line:
-                    category, resp = line.split(":", 1)
-                    category = category.strip()
-                    parts = resp.strip().split(". ", 2)
-                    if len(parts) >= 2:  # Ensure yes/no and explanation
-                        is_valid = parts[0].strip().lower() == "yes"
-                        explanation = parts[1].strip()
-                        is_unique = parts[2].strip().lower() == "unique" if len(parts) > 2 else True
-                        results[category] = (is_valid, explanation, is_unique)
-                    else:
-                        results[category] = (False, "Malformed response from API", True)
-        
-        # Fill missing categories
-        for category, _, _ in category_word_pairs:
-            if category not in results:
-                results[category] = (False, "No clear response from API", True)
-        return results
-    
-    except requests.RequestException as e:
-        print(f"Error calling Gemini API: {e}")
-        return {category: (False, f"API error: {str(e)}", True) for category, _, _ in category_word_pairs}
-
-def validate_multiplayer_answers(players_answers: dict[str, dict[str, str]], letter: str) -> dict[str, dict[str, tuple[bool, str, bool]]]:
-    """
-    Validate answers for all players in a multiplayer round.
-    Returns a nested dictionary mapping player IDs to their validation results.
-    """
-    validation_results = {}
-    all_answers = [answer for answers in players_answers.values() for answer in answers.values() if answer]
-    
-    for player_id, answers in players_answers.items():
-        category_word_pairs = [(category, letter, answer) for category, answer in answers.items() if answer]
-        player_results = validate_word(category_word_pairs) if category_word_pairs else {}
-        validation_results[player_id] = player_results
-    return validation_results
+async def _split_pairs_async(category_word_pairs):
+    """Non-blocking variant of _split_pairs."""
+    verdicts, candidates = _check_locally(category_word_pairs)
+    cached = await verdict_cache.get_many_async(list(candidates)) if candidates else {}
+    return verdicts, _add_cached(verdicts, candidates, cached)
+
+def _chunks(pairs):
+    return [pairs[i:i + GEMINI_BATCH_SIZE] for i in range(0, len(pairs), GEMINI_BATCH_SIZE)]
+
+def _learn(fresh):
+    from game_logic import CATEGORIES  # Not at the top: game_logic imports this module
+    lexicon.learn(fresh, CATEGORIES)
+
+def _store(chunk, fresh):
+    """Record one chunk's outcome: a verdict dict, or the ValidatorUnavailable it raised."""
+    if isinstance(fresh, ValidatorUnavailable):
+        print(f"Error calling Gemini API: {fresh}")
+        VALIDATOR_PAIRS.inc("fallback", amount=len(chunk))
+        return
+    with VALIDATOR_SECONDS.time("store"):
+        verdict_cache.put_many(fresh)
+        _learn(fresh)
+    VALIDATOR_PAIRS.inc("gemini", amount=len(chunk))
+
+async def _store_async(chunk, fresh):
+    """Non-blocking variant of _store."""
+    if isinstance(fresh, ValidatorUnavailable):
+        print(f"Error calling Gemini API: {fresh}")
+        VALIDATOR_PAIRS.inc("fallback", amount=len(chunk))
+        return
+    with VALIDATOR_SECONDS.time("store"):
+        await verdict_cache.put_many_async(fresh)
+        _learn(fresh)
+    VALIDATOR_PAIRS.inc("gemini", amount=len(chunk))
+
+def _verdict_from(fresh, category, word):
+    """A pair's verdict from its chunk's outcome."""
+    if isinstance(fresh, ValidatorUnavailable):
+        return _fallback_verdict(word)
+    return fresh.get((category, word), (False, "No clear response from API"))
+
+def _merge(verdicts, chunk, fresh):
+    _store(chunk, fresh)
+    for category, _, word in chunk:
+        verdicts[(category, word)] = _verdict_from(fresh, category, word)
+
+
+class Coalescer:
+    """
+    Merges concurrent validation requests. A pair that is already being
+    validated for another caller is not sent again; the caller waits on the
+    same in-flight future. New pairs are collected for up to `window` seconds,
+    or until `max_pairs` are waiting, and then sent together in chunks of
+    GEMINI_BATCH_SIZE. Each future resolves to its chunk's outcome.
+    """
+
+    def __init__(self, ask, window: float = GEMINI_COALESCE_WINDOW, max_pairs: int = GEMINI_BATCH_SIZE):
+        self.ask = ask
+        self.window = window
+        self.max_pairs = max_pairs
+        self.requests = 0
+        self.pairs = 0
+        self.joined = 0
+        self.batches = 0
+        self._inflight = {}  # (category, word) -> future
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    async def validate(self, misses: list[tuple[str, str, str]]) -> dict[tuple[str, str], tuple[bool, str]]:
+        """Verdicts for (category, letter, word) misses, keyed by (category, word)."""
+        loop = asyncio.get_running_loop()
+        futures = {}
+        self.requests += 1
+        for category, letter, word in misses:
+            key = (category, word)
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = loop.create_future()
+                self._pending.append((category, letter, word))
+                self.pairs += 1
+            else:
+                self.joined += 1
+            futures[key] = future
+
+        if len(self._pending) >= self.max_pairs:
+            self._flush()
+        elif self._pending and self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        if futures:
+            # asyncio.wait rather than gather: a cancelled caller must not cancel futures other callers share
+            await asyncio.wait(futures.values())
+        return {(category, word): _verdict_from(future.result(), category, word) for (category, word), future in futures.items()}
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        for chunk in _chunks(pending):
+            task = asyncio.create_task(self._send(chunk))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, chunk):
+        self.batches += 1
+        try:
+            fresh = await self.ask(chunk)
+        except ValidatorUnavailable as e:
+            fresh = e
+        except BaseException as e:
+            for category, _, word in chunk:
+                self._inflight.pop((category, word)).set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+        try:
+            await _store_async(chunk, fresh)
+        except Exception as e:
+            # The verdicts are still good for the callers waiting on them
+            print(f"Error storing verdicts: {e}")
+        for category, _, word in chunk:
+            self._inflight.pop((category, word)).set_result(fresh)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "pairs": self.pairs,
+            "joined": self.joined,
+            "batches": self.batches,
+            "in_flight": len(self._inflight),
+        }
+
+
+coalescer = Coalescer(_ask_gemini_async)
+
+def lookup_pairs(category_word_pairs: list[tuple[str, str, str]]):
+    """
+    The verdicts available without calling Gemini (starting letter, lexicon,
+    verdict cache), keyed by (category, normalized word), and the list of
+    (category, letter, word) pairs that would have to be sent.
+    """
+    with VALIDATOR_SECONDS.time("lookup"):
+        return _split_pairs(category_word_pairs)
+
+def validate_pairs(category_word_pairs: list[tuple[str, str, str]]) -> dict[tuple[str, str], tuple[bool, str]]:
+    """
+    Validate (category, letter, word) pairs, each unique pair once.
+    Verdicts already in the cache are answered locally; the misses are sent to
+    Gemini in chunks of GEMINI_BATCH_SIZE pairs.
+    Returns a dict mapping (category, normalized word) to (is_valid, explanation).
+    This blocks on the network; async callers should use validate_pairs_async.
+    """
+    with VALIDATOR_SECONDS.time("lookup"):
+        verdicts, misses = _split_pairs(category_word_pairs)
+    for chunk in _chunks(misses):
+        try:
+            fresh = _ask_gemini(chunk)
+        except ValidatorUnavailable as e:
+            fresh = e
+        _merge(verdicts, chunk, fresh)
+    return verdicts
+
+async def validate_pairs_async(category_word_pairs: list[tuple[str, str, str]]) -> dict[tuple[str, str], tuple[bool, str]]:
+    """
+    Non-blocking variant of validate_pairs. The misses go through the
+    coalescer, so they share upstream requests with concurrent callers.
+    When Gemini is unreachable or the circuit breaker is open, the misses are
+    rejected (see _fallback_verdict) instead of raising an error.
+    """
+    with VALIDATOR_SECONDS.time("lookup"):
+        verdicts, misses = await _split_pairs_async(category_word_pairs)
+    if misses:
+        verdicts.update(await coalescer.validate(misses))
+    return verdicts
+
+def _by_category(category_word_pairs, verdicts):
+    words = {category: normalize_word(word) for category, _, word in category_word_pairs}
+    word_counts = {}
+    for word in words.values():
+        word_counts[word] = word_counts.get(word, 0) + 1
+    return {
+        category: (*verdicts[(category, word)], word_counts[word] == 1)
+        for category, word in words.items()
+    }
+
+def validate_word(category_word_pairs: list[tuple[str, str, str]]) -> dict[str, tuple[bool, str, bool]]:
+    """
+    Validate one player's category-letter-word pairs.
+    Returns a dict mapping category to (is_valid, explanation, is_unique),
+    where is_unique is False when the same word was given for another category.
+    This blocks on the network; async callers should use validate_word_async.
+    """
+    return _by_category(category_word_pairs, validate_pairs(category_word_pairs))
+
+async def validate_word_async(category_word_pairs: list[tuple[str, str, str]]) -> dict[str, tuple[bool, str, bool]]:
+    """Non-blocking variant of validate_word with the same arguments and return value."""
+    return _by_category(category_word_pairs, await validate_pairs_async(category_word_pairs))
 
 def handle_vote(category: str, session_id: str, player_id: str, multiplayer_sessions: dict):
     """
@@ -0,0 +1,69 @@
+"""
+Local stand-in for the Gemini generateContent endpoint, for benchmarks.
+
+Answers every pair in the validator's prompt with the JSON array ai_validator
+parses, after a configurable delay, and fails a configurable fraction of
+requests with HTTP 503. A configurable fraction of verdicts is left out of the
+response, to exercise the validator's re-request of missing pairs. Words
+listed in FAKE_GEMINI_INVALID are judged invalid.
+
+    FAKE_GEMINI_LATENCY=0.4 FAKE_GEMINI_ERROR_RATE=0.05 uvicorn bench.fake_gemini:app --port 8765
+"""
+import asyncio
+import json
+import os
+import random
+import re
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY = float(os.getenv("FAKE_GEMINI_LATENCY", "0.3"))
+LATENCY_JITTER = float(os.getenv("FAKE_GEMINI_LATENCY_JITTER", "0.1"))
+ERROR_RATE = float(os.getenv("FAKE_GEMINI_ERROR_RATE", "0"))
+DROP_RATE = float(os.getenv("FAKE_GEMINI_DROP_RATE", "0"))
+INVALID_WORDS = set(filter(None, os.getenv("FAKE_GEMINI_INVALID", "").split(",")))
+
+PAIRS = re.compile(r"^Pairs:\n(\[.*\])$", re.MULTILINE)
+
+app = FastAPI()
+stats = {"requests": 0, "errors": 0, "pairs": 0}
+
+
+def answer(prompt: str) -> list[dict]:
+    match = PAIRS.search(prompt)
+    verdicts = []
+    for pair in json.loads(match.group(1)) if match else []:
+        if random.random() < DROP_RATE:
+            continue
+        category, word = pair["category"].lower(), pair["word"]
+        if word in INVALID_WORDS:
+            verdicts.append({"id": pair["id"], "valid": False, "explanation": f"'{word}' is not a kind of {category}."})
+        else:
+            verdicts.append({"id": pair["id"], "valid": True, "explanation": f"'{word}' is a well-known example of {category}."})
+    return verdicts
+
+
+@app.post("/v1beta/models/{model}")
+async def generate_content(model: str, request: Request):
+    stats["requests"] += 1
+    payload = await request.json()
+    prompt = payload["contents"][0]["parts"][0]["text"]
+    await asyncio.sleep(max(0.0, random.gauss(LATENCY, LATENCY_JITTER)))
+    if random.random() < ERROR_RATE:
+        stats["errors"] += 1
+        return JSONResponse({"error": {"code": 503, "message": "overloaded"}}, status_code=503)
+    verdicts = answer(prompt)
+    stats["pairs"] += len(verdicts)
+    return {"candidates": [{"content": {"parts": [{"text": json.dumps(verdicts)}], "role": "model"}}]}
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+
+@app.post("/reset")
+async def reset():
+    for key in stats:
+        stats[key] = 0
+    return stats
@@ -0,0 +1,278 @@
+"""
+Load test for WordRush against a local Gemini stand-in.
+
+Starts bench/fake_gemini.py and the app (uvicorn main:app) in subprocesses with
+throwaway databases, drives simulated multiplayer rooms through /game and
+/ws/{session_id} plus concurrent single-player /submit traffic, and writes a
+JSON report (latency percentiles, throughput, upstream Gemini calls) to
+bench/results/ so runs can be compared between commits.
+
+    python bench/run.py --rooms 20 --players 4 --rounds 3 --submits 300 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import protocol  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def summarize(samples: list[float]) -> dict:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": pct(50),
+        "p95": pct(95),
+        "p99": pct(99),
+        "max": ordered[-1],
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def make_answer(letter: str, overlap: float) -> str:
+    """A word for the letter; with probability `overlap` one from a small shared pool, to exercise caching."""
+    if random.random() < overlap:
+        return letter.lower() + random.choice(["alpha", "bravo", "delta", "omega", "sigma"])
+    return letter.lower() + "".join(random.choices(string.ascii_lowercase, k=7))
+
+
+def parse_game_page(html: str) -> tuple[str, str, list[str]]:
+    session_id = re.search(r'name="session_id" value="([^"]*)"', html).group(1)
+    letter = re.search(r'name="letter" value="([^"]*)"', html).group(1)
+    categories = re.findall(r'name="categories" value="([^"]*)"', html)
+    return session_id, letter, categories
+
+
+async def wait_ready(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def client_codec(args):
+    return {"v1": protocol.V1, **{codec.name: codec for codec in protocol.CODECS}}[args.protocol]
+
+
+async def receive_type(ws, message_type: str, timeout: float, codec=protocol.V1):
+    deadline = time.monotonic() + timeout
+    while True:
+        message = codec.decode(await asyncio.wait_for(ws.recv(), deadline - time.monotonic()))
+        if message.get("type") == message_type:
+            return message
+
+
+async def play_room(base_url: str, args, results: dict):
+    """One room: `players` sockets playing `rounds` rounds, everyone submitting at once."""
+    ws_url = base_url.replace("http://", "ws://")
+    codec = client_codec(args)
+    subprotocols = [codec.subprotocol] if codec.subprotocol else None
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        page = await client.get("/game", params={"mode": "multi", "player": "bench"})
+        session_id, _, _ = parse_game_page(page.text)
+        sockets = [await websockets.connect(f"{ws_url}/ws/{session_id}", subprotocols=subprotocols) for _ in range(args.players)]
+        try:
+            for ws in sockets:
+                await receive_type(ws, "timer_update", args.timeout, codec)
+            for _ in range(args.rounds):
+                page = await client.get("/game", params={"mode": "multi", "player": "bench", "session_id": session_id})
+                _, letter, categories = parse_game_page(page.text)
+                round_id = re.search(r'name="round_id" value="([^"]*)"', page.text).group(1)
+                round_start = time.perf_counter()
+
+                async def play(ws):
+                    answers = {category: make_answer(letter, args.overlap) for category in categories}
+                    sent = time.perf_counter()
+                    await ws.send(codec.encode({"type": "submit_answers", "round_id": round_id, "answers": answers}))
+                    await receive_type(ws, "round_results", args.timeout, codec)
+                    results["result_latency"].append(time.perf_counter() - sent)
+
+                outcomes = await asyncio.gather(*(play(ws) for ws in sockets), return_exceptions=True)
+                results["errors"] += sum(isinstance(o, BaseException) for o in outcomes)
+                results["round_latency"].append(time.perf_counter() - round_start)
+                results["rounds"] += 1
+        finally:
+            for ws in sockets:
+                await ws.close()
+
+
+async def submit_load(base_url: str, args, results: dict):
+    """`submits` single-player /submit posts from `concurrency` concurrent clients."""
+    queue = asyncio.Queue()
+    for _ in range(args.submits):
+        queue.put_nowait(None)
+
+    async def worker():
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            while not queue.empty():
+                queue.get_nowait()
+                page = await client.get("/game", params={"mode": "single", "player": "bench"})
+                _, letter, categories = parse_game_page(page.text)
+                round_id = re.search(r'name="round_id" value="([^"]*)"', page.text).group(1)
+                token = re.search(r'name="round_token" value="([^"]*)"', page.text).group(1)
+                form = {"player_name": "bench", "mode": "single", "session_id": "", "round_id": round_id, "round_token": token,
+                        "letter": letter, "categories": categories}
+                form.update({category: make_answer(letter, args.overlap) for category in categories})
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/submit", data=form)
+                    response.raise_for_status()
+                    results["latency"].append(time.perf_counter() - start)
+                except httpx.HTTPError:
+                    results["errors"] += 1
+
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+
+async def upstream_stats(client: httpx.AsyncClient) -> dict:
+    return (await client.get("/stats")).json()
+
+
+async def run(args, app_url: str, fake_url: str) -> dict:
+    report = {"commit": git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "config": vars(args)}
+    async with httpx.AsyncClient(base_url=fake_url) as fake, httpx.AsyncClient(base_url=app_url) as app:
+        if args.rooms:
+            before = await upstream_stats(fake)
+            app_before = await upstream_stats(app)
+            results = {"result_latency": [], "round_latency": [], "rounds": 0, "errors": 0}
+            start = time.perf_counter()
+            await asyncio.gather(*(play_room(app_url, args, results) for _ in range(args.rooms)))
+            elapsed = time.perf_counter() - start
+            after = await upstream_stats(fake)
+            app_after = await upstream_stats(app)
+            calls = after["requests"] - before["requests"]
+            # Per worker; only the whole picture with --workers 1
+            ws_bytes = app_after["broadcast"]["bytes_sent"] - app_before["broadcast"]["bytes_sent"]
+            report["multiplayer"] = {
+                "rooms": args.rooms,
+                "players": args.players,
+                "rounds": results["rounds"],
+                "errors": results["errors"],
+                "elapsed": elapsed,
+                "rounds_per_second": results["rounds"] / elapsed,
+                "result_latency": summarize(results["result_latency"]),
+                "round_latency": summarize(results["round_latency"]),
+                "upstream_calls": calls,
+                "upstream_calls_per_round": calls / results["rounds"] if results["rounds"] else None,
+                "ws_bytes_sent": ws_bytes,
+                "ws_bytes_per_round": ws_bytes / results["rounds"] if results["rounds"] else None,
+            }
+        if args.submits:
+            before = await upstream_stats(fake)
+            results = {"latency": [], "errors": 0}
+            start = time.perf_counter()
+            await submit_load(app_url, args, results)
+            elapsed = time.perf_counter() - start
+            after = await upstream_stats(fake)
+            calls = after["requests"] - before["requests"]
+            report["submit"] = {
+                "requests": args.submits,
+                "concurrency": args.concurrency,
+                "errors": results["errors"],
+                "elapsed": elapsed,
+                "requests_per_second": len(results["latency"]) / elapsed,
+                "latency": summarize(results["latency"]),
+                "upstream_calls": calls,
+                "upstream_calls_per_request": calls / args.submits,
+            }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=10, help="concurrent multiplayer rooms")
+    parser.add_argument("--players", type=int, default=4, help="players per room")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds per room")
+    parser.add_argument("--submits", type=int, default=200, help="single-player /submit requests")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent /submit clients")
+    parser.add_argument("--overlap", type=float, default=0.3, help="fraction of answers drawn from a shared pool")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the app")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake Gemini mean latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake Gemini requests that fail")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of verdicts fake Gemini leaves out")
+    parser.add_argument("--protocol", default="v1", choices=["v1"] + [codec.name for codec in protocol.CODECS],
+                        help="websocket protocol for the simulated players")
+    parser.add_argument("--timeout", type=float, default=60, help="per-message timeout (s)")
+    parser.add_argument("--output", help="report path (default bench/results/<timestamp>-<commit>.json)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="wordrush-bench-")
+    fake_port, app_port = free_port(), free_port()
+    fake_env = dict(os.environ, FAKE_GEMINI_LATENCY=str(args.latency), FAKE_GEMINI_ERROR_RATE=str(args.error_rate),
+                    FAKE_GEMINI_DROP_RATE=str(args.drop_rate))
+    app_env = dict(
+        os.environ,
+        GEMINI_API_KEY="bench",
+        GEMINI_API_BASE=f"http://127.0.0.1:{fake_port}",
+        DATABASE_URL=f"sqlite:///{workdir}/wordrush.db",
+        VERDICT_CACHE_PATH=f"{workdir}/verdict_cache.db",
+        SESSION_STORE_PATH=f"{workdir}/sessions.db",
+        LEXICON_INDEX_PATH=f"{workdir}/lexicon.idx",
+        LEXICON_LEARNED_PATH=f"{workdir}/lexicon_learned.tsv",
+        ROUND_SECRET_PATH=f"{workdir}/round_secret",
+        ROUND_LOG_PATH=f"{workdir}/rounds.jsonl",
+    )
+    uvicorn = [sys.executable, "-m", "uvicorn", "--host", "127.0.0.1", "--log-level", "warning"]
+    log = open(os.path.join(workdir, "server.log"), "w")
+    processes = [
+        subprocess.Popen(uvicorn + ["--port", str(fake_port), "bench.fake_gemini:app"], cwd=ROOT, env=fake_env, stdout=log, stderr=log),
+        subprocess.Popen(uvicorn + ["--port", str(app_port), "--workers", str(args.workers), "main:app"], cwd=ROOT, env=app_env, stdout=log, stderr=log),
+    ]
+    app_url, fake_url = f"http://127.0.0.1:{app_port}", f"http://127.0.0.1:{fake_port}"
+    try:
+        asyncio.run(wait_ready(f"{fake_url}/stats"))
+        asyncio.run(wait_ready(f"{app_url}/test"))
+        report = asyncio.run(run(args, app_url, fake_url))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+        log.close()
+
+    output = args.output or os.path.join(ROOT, "bench", "results", f"{report['timestamp'].replace(':', '')}-{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps({k: v for k, v in report.items() if k != "config"}, indent=2))
+    print(f"Report written to {output} (server log in {workdir}/server.log)")
+
+
+if __name__ == "__main__":
+    main()
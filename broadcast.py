@@ -0,0 +1,237 @@
+import asyncio
+import os
+import time
+from collections import defaultdict, deque
+from protocol import V1
+
+BROADCAST_QUEUE_SIZE = int(os.getenv("BROADCAST_QUEUE_SIZE", "64"))
+BROADCAST_SEND_TIMEOUT = float(os.getenv("BROADCAST_SEND_TIMEOUT", "5"))
+# Message types where only the latest pending copy matters
+COALESCED_TYPES = {"timer_update"}
+# Room-state message types sent to delta-capable clients as changes since the last one
+DELTA_TYPES = {"timer_update", "scoreboard"}
+
+
+class BroadcastStats:
+    """Counters shared by every connection of a Broadcaster."""
+
+    def __init__(self):
+        self.messages = 0
+        self.sent = 0
+        self.bytes_sent = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.dropped_clients = 0
+        self.send_seconds_total = 0.0
+        self.send_seconds_max = 0.0
+
+    def record_send(self, seconds: float, size: int):
+        self.sent += 1
+        self.bytes_sent += size
+        self.send_seconds_total += seconds
+        self.send_seconds_max = max(self.send_seconds_max, seconds)
+
+
+class ClientConnection:
+    """
+    One websocket with a bounded outbound queue drained by its own writer task,
+    so a slow client never holds up the sender. Queued messages of a coalesced
+    type are replaced by newer ones; a client whose queue overflows or whose
+    send times out is disconnected. Frames are already encoded with the
+    connection's `codec`; binary codecs produce bytes frames.
+    """
+
+    def __init__(self, websocket, stats: BroadcastStats, codec=V1, max_queue: int = BROADCAST_QUEUE_SIZE,
+                 send_timeout: float = BROADCAST_SEND_TIMEOUT):
+        self.websocket = websocket
+        self.stats = stats
+        self.codec = codec
+        # Delta message types this client has had a full copy of
+        self.synced = set()
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.closed = False
+        self._socket_closed = False
+        self._close_code = None
+        self._pending = deque()  # (coalesce_key, text)
+        self._wakeup = asyncio.Event()
+        self._writer_task = asyncio.create_task(self._writer())
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def send(self, frame, coalesce_key: str | None = None) -> bool:
+        """Queue an already encoded message. Returns False if the client is (now) dropped."""
+        if self.closed:
+            return False
+        if coalesce_key is not None:
+            for i, (key, _) in enumerate(self._pending):
+                if key == coalesce_key:
+                    self._pending[i] = (key, frame)
+                    self.stats.coalesced += 1
+                    return True
+        if len(self._pending) >= self.max_queue:
+            self._drop(code=1013)
+            return False
+        self._pending.append((coalesce_key, frame))
+        self._wakeup.set()
+        return True
+
+    async def _writer(self):
+        try:
+            while True:
+                while not self._pending:
+                    if self._close_code is not None:
+                        await self.close(code=self._close_code)
+                        return
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                _, frame = self._pending.popleft()
+                start = time.perf_counter()
+                if isinstance(frame, bytes):
+                    await asyncio.wait_for(self.websocket.send_bytes(frame), self.send_timeout)
+                else:
+                    await asyncio.wait_for(self.websocket.send_text(frame), self.send_timeout)
+                self.stats.record_send(time.perf_counter() - start, len(frame))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not self.closed:
+                print(f"Dropping websocket client after send failure: {e!r}")
+                self._drop(code=1011)
+
+    def close_when_sent(self, code: int = 1000):
+        """Close the socket once the messages already queued have been sent."""
+        self._close_code = code
+        self._wakeup.set()
+
+    def _drop(self, code: int):
+        """Disconnect a slow or broken client without waiting on it."""
+        if self.closed:
+            return
+        self.stats.dropped_clients += 1
+        asyncio.create_task(self.close(code=code))
+        self.closed = True
+
+    async def close(self, code: int = 1000):
+        """Stop the writer and close the socket; the receive loop then sees the disconnect."""
+        if self._socket_closed:
+            return
+        self._socket_closed = True
+        self.closed = True
+        self._pending.clear()
+        if self._writer_task is not asyncio.current_task():
+            self._writer_task.cancel()
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+
+class Broadcaster:
+    """
+    Fan-out to the websockets connected to this worker, by session and player.
+    Each message is encoded once per codec in use and queued on every
+    recipient's connection. For DELTA_TYPES the broadcaster remembers the
+    last copy sent to the session: delta-capable clients get only what
+    changed (or nothing), and a full copy the first time.
+    """
+
+    def __init__(self):
+        self.connections = defaultdict(dict)
+        self.stats = BroadcastStats()
+        self._last = defaultdict(dict)  # session_id -> message type -> last message broadcast
+
+    def add(self, session_id: str, player_id: str, websocket, codec=V1) -> ClientConnection:
+        connection = ClientConnection(websocket, self.stats, codec)
+        self.connections[session_id][player_id] = connection
+        return connection
+
+    async def remove(self, session_id: str, player_id: str):
+        """Forget a player's connection. Returns True if it was the last one of the session."""
+        players = self.connections.get(session_id, {})
+        connection = players.pop(player_id, None)
+        if connection is not None:
+            await connection.close()
+        if not players:
+            self.connections.pop(session_id, None)
+            self._last.pop(session_id, None)
+            return True
+        return False
+
+    def has_clients(self, session_id: str) -> bool:
+        return bool(self.connections.get(session_id))
+
+    def send(self, session_id: str, message: dict, to: str | None = None):
+        """Queue `message` for every local player of the session, or only for player `to`."""
+        players = self.connections.get(session_id)
+        if not players:
+            return
+        message_type = message.get("type")
+        coalesce_key = message_type if message_type in COALESCED_TYPES else None
+        self.stats.messages += 1
+        if to is not None:
+            recipients = [players[to]] if to in players else []
+        else:
+            recipients = list(players.values())
+
+        delta = message
+        if message_type in DELTA_TYPES:
+            last = self._last[session_id].get(message_type)
+            delta = _delta(message, last) if last is not None else message
+            if to is None:
+                self._last[session_id][message_type] = message
+
+        frames = {}  # (codec, full copy?) -> encoded frame, shared by every recipient
+        for connection in recipients:
+            codec = connection.codec
+            outgoing = message
+            if codec.deltas and message_type in DELTA_TYPES and message_type in connection.synced:
+                outgoing = delta
+            if outgoing is None:
+                self.stats.skipped += 1
+                continue
+            connection.synced.add(message_type)
+            key = (codec.name, outgoing is message)
+            if key not in frames:
+                frames[key] = codec.encode(outgoing)
+            connection.send(frames[key], coalesce_key)
+
+    def close_session(self, session_id: str, code: int = 1000):
+        """Close every local connection of the session after its queued messages are sent."""
+        for connection in self.connections.get(session_id, {}).values():
+            connection.close_when_sent(code)
+
+    def snapshot(self) -> dict:
+        depths = [c.queue_depth for players in self.connections.values() for c in players.values()]
+        stats = self.stats
+        return {
+            "sessions": len(self.connections),
+            "connections": len(depths),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "messages": stats.messages,
+            "sent": stats.sent,
+            "bytes_sent": stats.bytes_sent,
+            "skipped": stats.skipped,
+            "coalesced": stats.coalesced,
+            "dropped_clients": stats.dropped_clients,
+            "send_latency_avg": stats.send_seconds_total / stats.sent if stats.sent else 0.0,
+            "send_latency_max": stats.send_seconds_max,
+        }
+
+
+def _delta(message: dict, last: dict) -> dict | None:
+    """What changed in a room-state message since `last`; None if nothing did."""
+    if message.get("type") == "scoreboard":
+        scores, previous = message["scores"], last["scores"]
+        changed = {pid: entry for pid, entry in scores.items() if previous.get(pid) != entry}
+        removed = [pid for pid in previous if pid not in scores]
+        if not changed and not removed:
+            return None
+        return {"type": "scoreboard", "scores": changed, "removed": removed}
+    # Timer updates only change when a new round starts
+    if message.get("round_deadline") == last.get("round_deadline"):
+        return None
+    return message
@@ -0,0 +1,108 @@
+import os
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Index, MetaData, inspect, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///wordrush.db")
+if DATABASE_URL.startswith("postgres://"):
+    # Heroku-style URLs use a scheme SQLAlchemy no longer accepts
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+# PostgreSQL advisory lock held while a worker sets up the schema
+INIT_DB_LOCK_KEY = 0x776f7264
+
+
+def create_db_engine(url: str = DATABASE_URL):
+    """
+    SQLite gets WAL journaling, synchronous=NORMAL and a busy timeout so the
+    workers' writers queue instead of failing; other databases get a sized,
+    pre-pinged connection pool.
+    """
+    if url.startswith("sqlite"):
+        db_engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 10})
+
+        @event.listens_for(db_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA busy_timeout=10000")
+            cursor.close()
+
+        return db_engine
+    return create_engine(
+        url,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        pool_pre_ping=True,
+    )
+
+
+engine = create_db_engine()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base = declarative_base()
+metadata = MetaData()
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Score(Base):
+    __tablename__ = "scores"
+    id = Column(Integer, primary_key=True, index=True)
+    player_name = Column(String, index=True)
+    score = Column(Integer, index=True)
+    created_at = Column(DateTime, default=utcnow)
+
+    __table_args__ = (Index("ix_scores_created_at_score", "created_at", "score"),)
+
+
+class PlayerStats(Base):
+    """Per-player aggregates, maintained incrementally as scores are recorded."""
+    __tablename__ = "player_stats"
+    player_name = Column(String, primary_key=True)
+    best = Column(Integer, nullable=False, default=0, index=True)
+    total = Column(Integer, nullable=False, default=0, index=True)
+    games = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=utcnow)
+
+
+def init_db():
+    """
+    Create missing tables, columns and indexes, and backfill player aggregates.
+    Every worker runs this at startup, possibly at the same moment, so each
+    step tolerates another worker having just done it. On PostgreSQL, where
+    DDL is transactional, the workers also take turns under an advisory lock.
+    """
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": INIT_DB_LOCK_KEY})
+        for table in Base.metadata.sorted_tables:
+            conn.execute(CreateTable(table, if_not_exists=True))
+        if "created_at" not in {column["name"] for column in inspect(conn).get_columns("scores")}:
+            try:
+                conn.execute(text("ALTER TABLE scores ADD COLUMN created_at TIMESTAMP"))
+            except (OperationalError, ProgrammingError):
+                # Another worker added it first
+                if "created_at" not in {column["name"] for column in inspect(conn).get_columns("scores")}:
+                    raise
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+        if not conn.execute(text("SELECT 1 FROM player_stats LIMIT 1")).first():
+            backfill_player_stats(conn)
+
+
+def backfill_player_stats(conn):
+    """Fill an empty player_stats table from the scores table, skipping players another worker already added."""
+    conn.execute(text(
+        "INSERT INTO player_stats (player_name, best, total, games, updated_at) "
+        "SELECT player_name, MAX(score), SUM(score), COUNT(*), CURRENT_TIMESTAMP "
+        "FROM scores WHERE player_name IS NOT NULL GROUP BY player_name "
+        "ON CONFLICT (player_name) DO NOTHING"
+    ))
@@ -1,5 +1,11 @@
+import functools
+import hashlib
+import hmac
+import os
 import random
-from ai_validator import validate_word
+import secrets
+import time
+from ai_validator import validate_pairs_async, normalize_word
 
 CATEGORIES = [
     "Famous Celebrities", "Types of Fruit", "Types of Vegetables", "Cities in the World", "Countries",
@@ -22,42 +28,187 @@ CATEGORIES = [
     "Things That Are Circular", "Things That Are Square", "Things That Are Triangular", "Modes of Entertainment"
 ]
 LETTERS = list("ABCDEFGHIJKLMNOPRSTW")
+ROUND_SECONDS = 120
 
-def generate_round():
-    """Generate a new game round with a random letter and 10 categories."""
-    letter = random.choice(LETTERS)
-    categories = random.sample(CATEGORIES, 10)
-    return {"letter": letter, "categories": categories}
+ROUND_ID_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+ROUND_SEED_BITS = 40
+# Signs the round tokens handed out with single-player rounds. Every worker must
+# use the same secret: set ROUND_SECRET, or let the workers on a host share one
+# generated into ROUND_SECRET_PATH.
+ROUND_SECRET = os.getenv("ROUND_SECRET", "")
+ROUND_SECRET_PATH = os.getenv("ROUND_SECRET_PATH", "wordrush_round_secret")
+# How long after a round is handed out its answers are accepted
+ROUND_TOKEN_TTL = float(os.getenv("ROUND_TOKEN_TTL", str(ROUND_SECONDS * 5)))
 
-def calculate_score(answers, round_data):
-    """Calculate score based on validated answers and uniqueness."""
-    score = 0
+def round_id_from_seed(seed: int) -> str:
+    """Encode a round seed as a short base-36 round ID."""
+    digits = []
+    while True:
+        seed, digit = divmod(seed, 36)
+        digits.append(ROUND_ID_ALPHABET[digit])
+        if not seed:
+            return "".join(reversed(digits))
+
+def seed_from_round_id(round_id: str) -> int:
+    """Decode a round ID; raises ValueError for anything that is not one."""
+    seed = int(round_id, 36)
+    if not 0 <= seed < 2 ** ROUND_SEED_BITS:
+        raise ValueError(f"Round ID out of range: {round_id}")
+    return seed
+
+@functools.lru_cache(maxsize=4096)
+def _round_for_seed(seed: int) -> tuple[str, tuple[str, ...]]:
+    rng = random.Random(seed)
+    return rng.choice(LETTERS), tuple(rng.sample(CATEGORIES, 10))
+
+def round_from_seed(seed: int) -> dict:
+    """The round a seed stands for; the same seed always gives the same round."""
+    letter, categories = _round_for_seed(seed)
+    return {"letter": letter, "categories": list(categories), "round_id": round_id_from_seed(seed)}
+
+def round_from_id(round_id: str) -> dict:
+    return round_from_seed(seed_from_round_id(round_id))
+
+@functools.lru_cache(maxsize=1)
+def _round_secret() -> bytes:
+    if ROUND_SECRET:
+        return ROUND_SECRET.encode("utf-8")
+    if not os.path.exists(ROUND_SECRET_PATH):
+        # Written aside and linked into place, so racing workers all end up reading the same secret
+        tmp_path = f"{ROUND_SECRET_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp_path, ROUND_SECRET_PATH)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+    with open(ROUND_SECRET_PATH) as f:
+        return f.read().strip().encode("utf-8")
+
+def _round_signature(round_id: str, issued: int) -> str:
+    return hmac.new(_round_secret(), f"{round_id}.{issued}".encode("utf-8"), hashlib.sha256).hexdigest()[:24]
+
+def round_token(round_id: str) -> str:
+    """A token proving this server handed out the round just now; see check_round_token."""
+    issued = int(time.time())
+    return f"{issued:x}.{_round_signature(round_id, issued)}"
+
+def check_round_token(round_id: str, token: str):
+    """Raises ValueError unless `token` was issued for `round_id` by this server within ROUND_TOKEN_TTL."""
+    issued, _, signature = token.partition(".")
+    try:
+        issued = int(issued, 16)
+    except ValueError:
+        raise ValueError("Malformed round token") from None
+    if not hmac.compare_digest(signature, _round_signature(round_id, issued)):
+        raise ValueError("Round token does not match the round")
+    if not 0 <= time.time() - issued <= ROUND_TOKEN_TTL:
+        raise ValueError("Round token has expired")
+
+def _answer_key(category, answer):
+    return category, normalize_word(answer)
+
+def build_results(answers, round_data, verdicts):
+    """
+    Build a single player's per-category results from a verdict table mapping
+    (category, normalized word) to (is_valid, explanation). A valid answer is
+    worth 10 points, plus 5 if the player gave that word for no other category.
+    """
+    words = [normalize_word(answers[c]) for c in round_data["categories"] if answers.get(c)]
+    results = {}
+    for category in round_data["categories"]:
+        answer = answers.get(category, "")
+        if answer:
+            is_valid, explanation = verdicts.get(_answer_key(category, answer), (False, "Validation failed"))
+            points = (15 if words.count(normalize_word(answer)) == 1 else 10) if is_valid else 0
+        else:
+            is_valid, explanation, points = False, "No answer provided", 0
+        results[category] = {
+            "answer": answer,
+            "is_valid": is_valid,
+            "points": points,
+            "explanation": explanation,
+            "voted": False
+        }
+    return results
+
+def calculate_score(answers, round_data, verdicts):
+    """Calculate a single player's score from a verdict table (see build_results)."""
+    return sum(r["points"] for r in build_results(answers, round_data, verdicts).values())
+
+async def score_round(answers, round_data):
+    """
+    Validate and score a single-player round, with the same rules replay.py
+    re-scores it with. Returns (results, score).
+    """
     letter = round_data["letter"]
-    for category, answer in answers.items():
-        if answer and validate_word(category, letter, answer):
-            score += 10  # Valid answer
-            if not any(validate_word(category, letter, a) for a in answers.values() if a != answer and a):
-                score += 5  # Bonus for unique answer
-    return score
-
-def calculate_multiplayer_scores(players_answers, round_data):
+    pairs = [(category, letter, answers[category]) for category in round_data["categories"] if answers.get(category)]
+    verdicts = await validate_pairs_async(pairs) if pairs else {}
+    results = build_results(answers, round_data, verdicts)
+    return results, sum(r["points"] for r in results.values())
+
+def build_multiplayer_results(players_answers, round_data, verdicts):
     """
-    Calculate scores for all players in a multiplayer round.
+    Build each player's per-category results for a multiplayer round from a
+    verdict table mapping (category, normalized word) to (is_valid, explanation).
+    A valid answer is worth 10 points, plus 5 if no other player gave it for that category.
+    """
+    answer_counts = {}
+    for answers in players_answers.values():
+        for category in round_data["categories"]:
+            if answers.get(category):
+                key = _answer_key(category, answers[category])
+                answer_counts[key] = answer_counts.get(key, 0) + 1
+
+    results = {}
+    for player_id, answers in players_answers.items():
+        player_results = {}
+        for category in round_data["categories"]:
+            answer = answers.get(category, "")
+            if answer:
+                key = _answer_key(category, answer)
+                is_valid, explanation = verdicts.get(key, (False, "Validation failed"))
+                points = (15 if answer_counts[key] == 1 else 10) if is_valid else 0
+            else:
+                is_valid, explanation, points = False, "No answer provided", 0
+            player_results[category] = {
+                "answer": answer,
+                "is_valid": is_valid,
+                "points": points,
+                "explanation": explanation,
+                "voted": False
+            }
+        results[player_id] = player_results
+    return results
+
+def calculate_multiplayer_scores(players_answers, round_data, verdicts):
+    """
+    Calculate scores for all players in a multiplayer round from a verdict table.
     Returns a dictionary mapping player IDs to their scores.
     """
+    results = build_multiplayer_results(players_answers, round_data, verdicts)
+    return {player_id: sum(r["points"] for r in player_results.values()) for player_id, player_results in results.items()}
+
+async def score_multiplayer_round(players_answers, round_data):
+    """
+    Validate and score a whole multiplayer round. Every unique (category, word)
+    pair across all players is validated once, in chunked batches, and both the
+    per-player results and the scores are computed from that one verdict table.
+    Returns (results, scores), each keyed by player ID.
+    """
     letter = round_data["letter"]
-    scores = {}
-    all_answers = [answer for answers in players_answers.values() for answer in answers.values() if answer]
-    
-    for player_id, answers in players_answers.items():
-        score = 0
-        for category, answer in answers.items():
-            if answer and validate_word(category, letter, answer):
-                score += 10  # Valid answer
-                if not any(a == answer for a in all_answers if a != answer):
-                    score += 5  # Bonus for unique answer
-        scores[player_id] = score
-    return scores
+    pairs = [
+        (category, letter, answers[category])
+        for answers in players_answers.values()
+        for category in round_data["categories"]
+        if answers.get(category)
+    ]
+    verdicts = await validate_pairs_async(pairs)
+    results = build_multiplayer_results(players_answers, round_data, verdicts)
+    scores = {player_id: sum(r["points"] for r in player_results.values()) for player_id, player_results in results.items()}
+    return results, scores
 
 def handle_vote(category: str, session_id: str, player_id: str, multiplayer_sessions: dict):
     """
@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database import Score, PlayerStats, utcnow
+
+LEADERBOARD_TOP_N = int(os.getenv("LEADERBOARD_TOP_N", "100"))
+# Bounds how stale another worker's cached pages can be after a write here
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "10"))
+# Cached pages and player lookups per worker; the keys come from query parameters
+LEADERBOARD_CACHE_SIZE = int(os.getenv("LEADERBOARD_CACHE_SIZE", "512"))
+WINDOWS = ("all", "daily", "weekly")
+
+
+def window_start(window: str, now: datetime | None = None) -> datetime | None:
+    """Start (UTC) of the current daily or weekly window; None for all-time."""
+    now = now or utcnow()
+    if window == "daily":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == "weekly":
+        return (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == "all":
+        return None
+    raise ValueError(f"Unknown leaderboard window: {window}")
+
+
+def _add_player_stats(db, totals: dict[str, tuple[int, int, int]], now: datetime):
+    """
+    Add (best, total, games) per player name to player_stats in the database
+    itself, so concurrent writers for the same name never lose an update.
+    Rows are upserted in name order, so concurrent batches lock them in the same order.
+    """
+    table = PlayerStats.__table__
+    rows = [
+        {"player_name": name, "best": best, "total": total, "games": games, "updated_at": now}
+        for name, (best, total, games) in sorted(totals.items())
+    ]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        greatest = func.greatest if dialect == "postgresql" else func.max
+        stmt = insert(table).values(rows)
+        db.execute(stmt.on_conflict_do_update(index_elements=[table.c.player_name], set_={
+            "best": greatest(table.c.best, stmt.excluded.best),
+            "total": table.c.total + stmt.excluded.total,
+            "games": table.c.games + stmt.excluded.games,
+            "updated_at": stmt.excluded.updated_at,
+        }))
+        return
+    for row in rows:
+        updated = db.execute(table.update().where(table.c.player_name == row["player_name"]).values(
+            best=func.greatest(table.c.best, row["best"]),
+            total=table.c.total + row["total"],
+            games=table.c.games + row["games"],
+            updated_at=now,
+        ))
+        if not updated.rowcount:
+            db.execute(table.insert().values(row))
+
+
+def _row(score: Score) -> dict:
+    return {"id": score.id, "player_name": score.player_name, "score": score.score, "created_at": score.created_at}
+
+
+class Leaderboard:
+    """
+    Leaderboard queries served from memory. The all-time top N scores are kept
+    materialized and updated incrementally as scores are recorded; other pages,
+    time windows and per-player aggregates are read from the database and
+    cached, in an LRU of `cache_size`, until the next write (or LEADERBOARD_CACHE_TTL).
+    """
+
+    def __init__(self, session_factory, top_n: int = LEADERBOARD_TOP_N, cache_ttl: float = LEADERBOARD_CACHE_TTL,
+                 cache_size: int = LEADERBOARD_CACHE_SIZE):
+        self.session_factory = session_factory
+        self.top_n = top_n
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.version = 0
+        self._top = None
+        self._top_loaded_at = 0.0
+        self._cache = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def record(self, db, entries: list[tuple[str, int]]) -> list[Score]:
+        """
+        Insert scores for (player_name, score) entries and update the player
+        aggregates in the same transaction, then update the in-memory views.
+        """
+        now = utcnow()
+        rows = [Score(player_name=name, score=score, created_at=now) for name, score in entries]
+        db.add_all(rows)
+        totals = {}
+        for name, score in entries:
+            best, total, games = totals.get(name, (score, 0, 0))
+            totals[name] = (max(best, score), total + score, games + 1)
+        _add_player_stats(db, totals, now)
+        db.commit()
+        self._apply(rows)
+        return rows
+
+    def _apply(self, rows: list[Score]):
+        new = [_row(score) for score in rows]
+        with self._lock:
+            self.version += 1
+            self._cache.clear()
+            if self._top is not None:
+                merged = sorted(self._top + new, key=lambda r: (-r["score"], r["id"]))
+                self._top = merged[:self.top_n]
+
+    def _top_scores(self) -> list[dict]:
+        with self._lock:
+            if self._top is not None and time.monotonic() - self._top_loaded_at < self.cache_ttl:
+                return self._top
+        db = self.session_factory()
+        try:
+            top = [_row(s) for s in db.query(Score).order_by(Score.score.desc(), Score.id).limit(self.top_n)]
+        finally:
+            db.close()
+        with self._lock:
+            self._top = top
+            self._top_loaded_at = time.monotonic()
+        return top
+
+    def _cached(self, key, load):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > now:
+                self._cache.move_to_end(key)
+                return entry[1]
+            if entry:
+                del self._cache[key]
+        value = load()
+        with self._lock:
+            self._cache[key] = (now + self.cache_ttl, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return value
+
+    def page(self, window: str = "all", page: int = 1, per_page: int = 10) -> dict:
+        """One page of the score leaderboard for a window ("all", "daily" or "weekly")."""
+        page = max(page, 1)
+        offset = (page - 1) * per_page
+        start = window_start(window)
+
+        if window == "all" and offset + per_page < self.top_n:
+            top = self._top_scores()
+            rows, has_next = top[offset:offset + per_page], len(top) > offset + per_page
+        else:
+            def load():
+                db = self.session_factory()
+                try:
+                    query = db.query(Score)
+                    if start is not None:
+                        query = query.filter(Score.created_at >= start)
+                    found = [_row(s) for s in query.order_by(Score.score.desc(), Score.id).offset(offset).limit(per_page + 1)]
+                finally:
+                    db.close()
+                return found[:per_page], len(found) > per_page
+            rows, has_next = self._cached(("scores", window, start, page, per_page), load)
+
+        ranked = [dict(row, rank=offset + i) for i, row in enumerate(rows, 1)]
+        return {"window": window, "page": page, "per_page": per_page, "has_next": has_next, "scores": ranked}
+
+    def players(self, order_by: str = "best", page: int = 1, per_page: int = 10) -> dict:
+        """One page of players ranked by their best or total score."""
+        column = {"best": PlayerStats.best, "total": PlayerStats.total, "games": PlayerStats.games}[order_by]
+        page = max(page, 1)
+        offset = (page - 1) * per_page
+
+        def load():
+            db = self.session_factory()
+            try:
+                found = db.query(PlayerStats).order_by(column.desc(), PlayerStats.player_name).offset(offset).limit(per_page + 1).all()
+                return [
+                    {"player_name": p.player_name, "best": p.best, "total": p.total, "games": p.games}
+                    for p in found
+                ]
+            finally:
+                db.close()
+
+        found = self._cached(("players", order_by, page, per_page), load)
+        ranked = [dict(row, rank=offset + i) for i, row in enumerate(found[:per_page], 1)]
+        return {"order_by": order_by, "page": page, "per_page": per_page, "has_next": len(found) > per_page, "players": ranked}
+
+    def player(self, player_name: str) -> dict | None:
+        """Aggregates for one player, or None if they have no recorded scores."""
+        def load():
+            db = self.session_factory()
+            try:
+                p = db.get(PlayerStats, player_name)
+                return {"player_name": p.player_name, "best": p.best, "total": p.total, "games": p.games} if p else None
+            finally:
+                db.close()
+
+        return self._cached(("player", player_name), load)
@@ -0,0 +1,178 @@
+import mmap
+import os
+import threading
+from verdict_cache import normalize_key
+
+LEXICON_SEED_PATH = os.getenv("LEXICON_SEED_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexicon", "seed.tsv"))
+LEXICON_LEARNED_PATH = os.getenv("LEXICON_LEARNED_PATH", "lexicon_learned.tsv")
+LEXICON_INDEX_PATH = os.getenv("LEXICON_INDEX_PATH", "lexicon.idx")
+
+
+def _read_entries(path):
+    """Yield normalized (category, word) entries from a `category<TAB>word` file."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#") or "\t" not in line:
+                continue
+            category, word = line.split("\t", 1)
+            category, word = normalize_key(category, word)
+            if category and word:
+                yield category, word
+
+
+def build_index(source_paths, index_path: str = LEXICON_INDEX_PATH) -> int:
+    """
+    Build the on-disk index from `category<TAB>word` source files. The index
+    holds one `category<TAB>word` line per entry, sorted, so every
+    (category, first letter) partition is a contiguous run that can be
+    binary-searched through a memory map. Returns the number of entries written.
+    """
+    entries = set()
+    for path in source_paths:
+        entries.update(_read_entries(path))
+    lines = sorted(f"{category}\t{word}\n" for category, word in entries)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    os.replace(tmp_path, index_path)
+    return len(lines)
+
+
+class Lexicon:
+    """
+    Local dictionary of known-valid answers per category, used to answer
+    validation checks without a network call. The sorted index is memory-mapped
+    and binary-searched; entries learned at runtime are kept in memory and
+    appended to a journal that is merged into the index on the next build.
+    """
+
+    def __init__(self, seed_path: str = LEXICON_SEED_PATH, learned_path: str = LEXICON_LEARNED_PATH,
+                 index_path: str = LEXICON_INDEX_PATH):
+        self.seed_path = seed_path
+        self.learned_path = learned_path
+        self.index_path = index_path
+        self.hits = 0
+        self.misses = 0
+        self._learned = set()
+        self._lock = threading.Lock()
+        self._file = None
+        self._map = None
+        self.load()
+
+    def _sources(self):
+        return [path for path in (self.seed_path, self.learned_path) if path and os.path.exists(path)]
+
+    def load(self):
+        """(Re)build the index if any source is newer than it, then memory-map it."""
+        sources = self._sources()
+        if self.index_path and sources:
+            index_mtime = os.path.getmtime(self.index_path) if os.path.exists(self.index_path) else 0
+            if any(os.path.getmtime(path) > index_mtime for path in sources):
+                build_index(sources, self.index_path)
+        with self._lock:
+            self.close()
+            self._learned = set(_read_entries(self.learned_path)) if self.learned_path else set()
+            if self.index_path and os.path.exists(self.index_path) and os.path.getsize(self.index_path):
+                self._file = open(self.index_path, "rb")
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _line_start(self, pos: int) -> int:
+        return self._map.rfind(b"\n", 0, pos) + 1
+
+    def _lower_bound(self, key: bytes) -> int:
+        """Byte offset of the first index line that sorts at or after `key`."""
+        lo, hi = 0, len(self._map)
+        while lo < hi:
+            mid = self._line_start((lo + hi) // 2)
+            end = self._map.find(b"\n", mid)
+            if self._map[mid:end] < key:
+                lo = end + 1
+            else:
+                hi = mid
+        return lo
+
+    def _indexed(self, category: str, word: str) -> bool:
+        if self._map is None:
+            return False
+        key = f"{category}\t{word}".encode("utf-8")
+        pos = self._lower_bound(key)
+        return self._map[pos:pos + len(key) + 1] == key + b"\n"
+
+    def contains(self, category: str, word: str) -> bool:
+        """True when the word is a known valid answer for the category."""
+        key = normalize_key(category, word)
+        with self._lock:
+            found = key in self._learned or self._indexed(*key)
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found
+
+    def words_for(self, category: str, letter: str) -> list[str]:
+        """All known valid answers for the category that start with the letter."""
+        category, prefix = normalize_key(category, letter)
+        words = {word for c, word in self._learned if c == category and word.startswith(prefix)}
+        with self._lock:
+            if self._map is not None:
+                start = f"{category}\t{prefix}".encode("utf-8")
+                pos = self._lower_bound(start)
+                while pos < len(self._map):
+                    end = self._map.find(b"\n", pos)
+                    line = self._map[pos:end]
+                    if not line.startswith(start):
+                        break
+                    words.add(line.decode("utf-8").split("\t", 1)[1])
+                    pos = end + 1
+        return sorted(words)
+
+    def answer_counts(self) -> dict[tuple[str, str], int]:
+        """Number of known valid answers per (normalized category, first letter)."""
+        counts = {}
+        with self._lock:
+            entries = set(self._learned)
+            if self._map is not None:
+                for line in self._map[:].decode("utf-8").splitlines():
+                    category, word = line.split("\t", 1)
+                    entries.add((category, word))
+        for category, word in entries:
+            counts[(category, word[0])] = counts.get((category, word[0]), 0) + 1
+        return counts
+
+    def learn(self, verdicts: dict[tuple[str, str], tuple[bool, str]], categories) -> int:
+        """
+        Add the valid words from a verdict table (as produced by the validator)
+        to the lexicon, for the given categories only: verdicts for any other
+        category (e.g. from /validate) are not kept. Returns the number of new entries.
+        """
+        allowed = {normalize_key(category, "")[0] for category in categories}
+        new = []
+        with self._lock:
+            for (category, word), (is_valid, _) in verdicts.items():
+                key = normalize_key(category, word)
+                if is_valid and key[0] in allowed and key not in self._learned and not self._indexed(*key):
+                    self._learned.add(key)
+                    new.append(key)
+        if new and self.learned_path:
+            with open(self.learned_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{category}\t{word}\n" for category, word in new))
+        return len(new)
+
+    def stats(self) -> dict:
+        return {
+            "indexed_bytes": len(self._map) if self._map is not None else 0,
+            "learned": len(self._learned),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
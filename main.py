@@ -1,33 +1,137 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Form, Query
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import create_engine, Column, Integer, String, MetaData
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from ai_validator import validate_word, validate_multiplayer_answers
-from game_logic import generate_round, calculate_score, calculate_multiplayer_scores
+from fastapi.websockets import WebSocketState
+from database import SessionLocal, init_db
+from leaderboard import Leaderboard, WINDOWS, LEADERBOARD_CACHE_TTL
+from score_writer import ScoreWriter
+from ai_validator import validate_word_async, verdict_cache, lexicon, coalescer, close_async_client
+from verdict_cache import VERDICT_CACHE_EVICT_INTERVAL
+from game_logic import round_from_id, round_token, check_round_token, score_round, score_multiplayer_round, ROUND_SECONDS
+from round_pool import RoundPool
+from session_store import create_session_store
+from rooms import RoomManager, RoomError, touch
+from broadcast import Broadcaster
+from page_cache import PageCache, CachedStaticFiles, STATIC_DIR, static_url
+from round_log import RoundLog
+import metrics
+import protocol
+import asyncio
+import os
 import random
 import string
-from collections import defaultdict
-import json
+import time
 
-DATABASE_URL = "sqlite:///wordrush.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-metadata = MetaData()
-
-class Score(Base):
-    __tablename__ = "scores"
-    id = Column(Integer, primary_key=True, index=True)
-    player_name = Column(String, index=True)
-    score = Column(Integer)
-
-Base.metadata.create_all(bind=engine)
+init_db()
+leaderboard_cache = Leaderboard(SessionLocal)
+score_writer = ScoreWriter(leaderboard_cache, SessionLocal)
+round_pool = RoundPool([lexicon.answer_counts, verdict_cache.answer_counts])
+round_log = RoundLog()
 
 app = FastAPI()
+app.add_middleware(metrics.MetricsMiddleware)
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
 templates = Jinja2Templates(directory="templates")
-multiplayer_sessions = defaultdict(dict)
+templates.env.globals["static_url"] = static_url
+metrics.instrument_templates(templates.env)
+pages = PageCache(templates.env)
+multiplayer_sessions = create_session_store()
+rooms = RoomManager(multiplayer_sessions, round_pool.take)
+# Websockets connected to this worker, by session and player; room state lives in multiplayer_sessions
+broadcaster = Broadcaster()
+# Round clock task per session with players on this worker
+session_timers = {}
+verdict_cache_evictor = None
+TIMER_SYNC_INTERVAL = float(os.getenv("TIMER_SYNC_INTERVAL", "15"))
+# Extra time after the deadline for clients' automatic submissions to arrive
+ROUND_GRACE_SECONDS = float(os.getenv("ROUND_GRACE_SECONDS", "2"))
+
+WS_MESSAGE_TYPES = ('submit_answers', 'vote', 'chat_message')
+WS_MESSAGE_SECONDS = metrics.Histogram(
+    "wordrush_ws_message_seconds", "Time to handle an incoming websocket message, by type.", ("type",))
+WS_CONNECTIONS = metrics.Counter(
+    "wordrush_ws_connections_total", "Websocket connections, by event and protocol.", ("event", "protocol"))
+
+metrics.register_stats("wordrush_rooms", rooms.stats)
+metrics.register_stats("wordrush_broadcast", broadcaster.snapshot)
+metrics.register_stats("wordrush_verdict_cache", verdict_cache.stats)
+metrics.register_stats("wordrush_lexicon", lexicon.stats)
+metrics.register_stats("wordrush_coalescer", coalescer.stats)
+metrics.register_stats("wordrush_score_writer", score_writer.stats)
+metrics.register_stats("wordrush_round_pool", round_pool.stats)
+metrics.register_stats("wordrush_page_cache", pages.stats)
+metrics.register_stats("wordrush_round_log", round_log.stats)
+
+@app.on_event("startup")
+async def warm_verdict_cache():
+    loaded = await asyncio.to_thread(verdict_cache.warm)
+    print(f"Verdict cache warmed with {loaded} entries")
+
+async def evict_verdict_cache():
+    """Delete expired and excess verdict cache rows now and every VERDICT_CACHE_EVICT_INTERVAL."""
+    while True:
+        try:
+            deleted = await asyncio.to_thread(verdict_cache.evict_expired)
+            if deleted:
+                print(f"Evicted {deleted} verdict cache entries")
+        except Exception as e:
+            print(f"Error evicting verdict cache entries: {e}")
+        await asyncio.sleep(VERDICT_CACHE_EVICT_INTERVAL)
+
+@app.on_event("startup")
+async def start_verdict_cache_evictor():
+    global verdict_cache_evictor
+    verdict_cache_evictor = asyncio.create_task(evict_verdict_cache())
+
+@app.on_event("startup")
+async def start_round_pool():
+    await round_pool.start()
+
+@app.on_event("startup")
+async def start_session_listener():
+    await multiplayer_sessions.start_listener(deliver)
+
+@app.on_event("startup")
+async def start_score_writer():
+    score_writer.start()
+
+@app.on_event("startup")
+async def start_room_sweeper():
+    await rooms.start()
+
+@app.on_event("shutdown")
+async def stop_room_sweeper():
+    await rooms.stop()
+
+@app.on_event("shutdown")
+async def stop_round_pool():
+    await round_pool.stop()
+
+@app.on_event("shutdown")
+async def drain_score_writer():
+    await score_writer.stop()
+
+@app.on_event("shutdown")
+async def stop_verdict_cache_evictor():
+    if verdict_cache_evictor is not None:
+        verdict_cache_evictor.cancel()
+
+@app.on_event("shutdown")
+async def close_validator_client():
+    await close_async_client()
+
+@app.on_event("shutdown")
+async def stop_session_listener():
+    await multiplayer_sessions.stop_listener()
+
+@app.on_event("shutdown")
+async def close_round_log():
+    round_log.close()
+
+@app.on_event("shutdown")
+async def stop_session_timers():
+    for task in list(session_timers.values()):
+        task.cancel()
 
 def generate_session_id():
     return ''.join(random.choices(string.ascii_uppercase, k=4))
@@ -37,11 +141,11 @@ def generate_player_id():
 
 @app.get("/")
 async def home(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return pages.page(request, "index.html", {}, key="")
 
 @app.get("/multiplayer")
 async def multiplayer(request: Request, player: str = "Player"):
-    return templates.TemplateResponse("multiplayer.html", {"request": request, "player_name": player})
+    return pages.page(request, "multiplayer.html", {"player_name": player}, key=player)
 
 @app.get("/game")
 async def game(
@@ -49,38 +153,45 @@ async def game(
     mode: str = "single",
     player: str = "Player",
     show_results: bool = False,
-    session_id: str = Query(None)
+    session_id: str = Query(None),
+    round_id: str = Query(None)
 ):
     if mode == "multi":
-        if session_id and session_id in multiplayer_sessions:
-            session_data = multiplayer_sessions[session_id]
-            total_score = sum(p['score'] for p in session_data['players'].values()) if session_data['players'] else 0
-        else:
-            session_id = generate_session_id()
-            multiplayer_sessions[session_id] = {
-                'players': {},
-                'round_data': generate_round(),
-                'votes': {},
-                'time_left': 120
-            }
-            session_data = multiplayer_sessions[session_id]
-            total_score = 0
-        return templates.TemplateResponse("game.html", {
-            "request": request,
-            "letter": session_data['round_data']["letter"],
-            "categories": session_data['round_data']["categories"],
+        session_data = await rooms.open(session_id) if session_id else None
+        if session_data is None:
+            try:
+                session_id = await rooms.allocate()
+            except RoomError as e:
+                return HTMLResponse(f"<h1>{e}</h1>", status_code=503)
+            session_data = await multiplayer_sessions.get(session_id)
+        total_score = sum(p['score'] for p in session_data['players'].values()) if session_data['players'] else 0
+        round_data = session_data['round_data']
+        # Everyone in the room gets the same page until the round or their score changes
+        key = (session_id, round_data.get("round_id"), player, total_score, show_results)
+        return pages.page(request, "game.html", lambda: {
+            "letter": round_data["letter"],
+            "categories": round_data["categories"],
+            "round_fields": round_fields(round_data),
+            "round_id": round_data.get("round_id", ""),
+            "round_token": "",
             "total_score": total_score,
             "session_id": session_id,
             "mode": mode,
             "player_name": player,
             "show_results": show_results
-        })
+        }, key=key)
     else:
-        round_data = generate_round()
-        return templates.TemplateResponse("game.html", {
-            "request": request,
+        # A round ID (e.g. from a shared link) replays that round; otherwise the next pooled one
+        try:
+            round_data = round_from_id(round_id) if round_id else round_pool.take()
+        except ValueError as e:
+            return HTMLResponse(f"<h1>Invalid round: {e}</h1>", status_code=400)
+        return pages.page(request, "game.html", {
             "letter": round_data["letter"],
             "categories": round_data["categories"],
+            "round_fields": round_fields(round_data),
+            "round_id": round_data["round_id"],
+            "round_token": round_token(round_data["round_id"]),
             "total_score": 0,
             "session_id": generate_session_id(),
             "mode": mode,
@@ -88,50 +199,40 @@ async def game(
             "show_results": show_results
         })
 
+def round_fields(round_data):
+    """The answer inputs for a round, rendered once per round."""
+    key = round_data.get("round_id") or tuple(round_data["categories"])
+    return pages.fragment("fragments/round_fields.html", key, categories=round_data["categories"])
+
 @app.post("/submit", response_class=HTMLResponse)
 async def submit(request: Request):
     form_data = await request.form()
-    answers = {k: v for k, v in form_data.items() if k not in ["player_name", "mode", "session_id", "letter", "categories"]}
     player_name = form_data.get("player_name", "Player")
     mode = form_data.get("mode", "single")
     session_id = form_data.get("session_id", "")
-    letter = form_data.get("letter", "")
-    categories = [form_data.getlist("categories")[i] for i in range(len(form_data.getlist("categories")))]
+    round_id = form_data.get("round_id", "")
 
-    if mode == "multi":
-        session_data = multiplayer_sessions.get(session_id, {})
-        round_data = session_data.get("round_data", generate_round())
+    # The round is rebuilt from its ID rather than trusting the letter and categories posted back,
+    # and only rounds this server handed out (recently) are accepted
+    session_data = await multiplayer_sessions.get(session_id) if mode == "multi" else None
+    if session_data:
+        round_data = session_data["round_data"]
     else:
-        round_data = {"letter": letter, "categories": categories}
-
-    category_word_pairs = [(category, letter, answer) for category, answer in answers.items() if answer]
-    validation_results = validate_word(category_word_pairs) if category_word_pairs else {}
-
-    results = {}
-    for category, answer in answers.items():
-        if answer:
-            is_valid, explanation, is_unique = validation_results.get(category, (False, "Validation failed", True))
-            points = 10 if is_valid else 0
-            uniqueness_bonus = 5 if is_valid and is_unique else 0
-        else:
-            is_valid, explanation, is_unique = False, "No answer provided", True
-            points = uniqueness_bonus = 0
-        results[category] = {
-            "answer": answer,
-            "is_valid": is_valid,
-            "points": points + uniqueness_bonus,
-            "explanation": explanation,
-            "voted": False
-        }
+        try:
+            check_round_token(round_id, form_data.get("round_token", ""))
+            round_data = round_from_id(round_id)
+        except ValueError as e:
+            return HTMLResponse(f"<h1>Invalid round: {e}</h1>", status_code=400)
+    letter = round_data["letter"]
+    categories = round_data["categories"]
+    answers = {category: form_data.get(category, "") for category in categories}
 
-    round_score = sum(result["points"] for result in results.values())
+    results, round_score = await score_round(answers, round_data)
     total_score = round_score  # For single-player mode
 
-    db = SessionLocal()
-    new_score = Score(player_name=player_name, score=round_score)
-    db.add(new_score)
-    db.commit()
-    db.close()
+    # Scored on its own, like any single-player round, so it is logged (and replayed) as one
+    round_log.record('single', round_data, {session_id: (player_name, results, round_score)})
+    await score_writer.submit(player_name, round_score)
 
     return templates.TemplateResponse("game.html", {
         "request": request,
@@ -142,6 +243,7 @@ async def submit(request: Request):
         "mode": mode,
         "player_name": player_name,
         "show_results": True,
+        "round_id": round_data.get("round_id", ""),
         "results": results,
         "round_score": round_score
     })
@@ -155,149 +257,312 @@ async def vote(request: Request):
     session_id = form_data.get("session_id", "")
 
     if mode == "multi":
-        session_data = multiplayer_sessions.get(session_id, {})
-        if session_data:
-            session_data['votes'][category] = True
+        def add_vote(session):
+            session['votes'][category] = True
+            touch(session)
+            return True
+
+        if await multiplayer_sessions.update(session_id, add_vote):
             return {"status": "success", "message": f"Vote for {category} accepted by {player_name}"}
     return {"status": "success", "message": f"Vote for {category} accepted by {player_name}"}
 
+def claim_round(session, force=False):
+    """
+    If every player in the room has submitted, or `force` is set because the
+    round clock ran out, take their answers (blank for players who did not
+    submit) and start the next round. Returns (round_data, players_answers) of
+    the finished round, or None.
+    Runs inside a store update, so only one worker can claim a given round.
+    """
+    players = session['players']
+    if not players or (not force and any(p['answers'] is None for p in players.values())):
+        return None
+    finished = (session['round_data'], {pid: p['answers'] or {} for pid, p in players.items()})
+    if any(p['answers'] is not None for p in players.values()):
+        touch(session)
+    for player in players.values():
+        player['answers'] = None
+    session['round_data'] = round_pool.take()
+    session['round_deadline'] = time.time() + ROUND_SECONDS
+    return finished
+
+def timer_message(session):
+    deadline = session['round_deadline']
+    return {
+        'type': 'timer_update',
+        'time_left': max(0, round(deadline - time.time())),
+        'round_deadline': deadline
+    }
+
+def scoreboard_message(session):
+    return {
+        'type': 'scoreboard',
+        'scores': {pid: {'name': p['name'], 'score': p['score']} for pid, p in session['players'].items()}
+    }
+
+async def finish_round(session_id: str, round_data: dict, players_answers: dict):
+    validation_results, scores = await score_multiplayer_round(players_answers, round_data)
+
+    names = {pid: pid for pid in scores}  # Players who left before the round ended are logged by ID
+
+    def add_scores(session):
+        totals = {}
+        for pid, player in session['players'].items():
+            if pid in scores:
+                player['score'] += scores[pid]
+                totals[pid] = player['score']
+                names[pid] = player['name']
+        return totals
+
+    totals = await multiplayer_sessions.update(session_id, add_scores) or {}
+    round_log.record('multi', round_data, {pid: (names[pid], validation_results[pid], scores[pid]) for pid in scores})
+    for pid, total_score in totals.items():
+        await multiplayer_sessions.publish(session_id, {
+            'type': 'round_results',
+            'results': validation_results[pid],
+            'round_score': scores[pid],
+            'total_score': total_score
+        }, to=pid)
+    session = await multiplayer_sessions.get(session_id)
+    if session:
+        await multiplayer_sessions.publish(session_id, scoreboard_message(session))
+        await multiplayer_sessions.publish(session_id, timer_message(session))
+
+async def run_round_timer(session_id: str):
+    """
+    Own the round clock of a session while this worker has players in it.
+    Local clients get a low-frequency resync (they count down to round_deadline
+    themselves) and the round is finalized when the deadline passes, whether or
+    not anyone sent a message. Every worker with players in the room runs one;
+    claim_round makes sure only one of them finalizes each round.
+    """
+    while broadcaster.has_clients(session_id):
+        session = await multiplayer_sessions.get(session_id)
+        if session is None or session['round_deadline'] is None:
+            break
+        remaining = session['round_deadline'] + ROUND_GRACE_SECONDS - time.time()
+        if remaining <= 0:
+            finished = await multiplayer_sessions.update(session_id, lambda s: claim_round(s, force=True))
+            if finished:
+                await finish_round(session_id, *finished)
+            else:
+                await asyncio.sleep(1)
+            continue
+        await asyncio.sleep(min(remaining, TIMER_SYNC_INTERVAL))
+        if remaining > TIMER_SYNC_INTERVAL:
+            session = await multiplayer_sessions.get(session_id)
+            if session:
+                await deliver(session_id, timer_message(session))
+
+def ensure_round_timer(session_id: str):
+    task = session_timers.get(session_id)
+    if task is None or task.done():
+        task = asyncio.create_task(run_round_timer(session_id))
+        session_timers[session_id] = task
+        task.add_done_callback(lambda t: session_timers.pop(session_id, None) if session_timers.get(session_id) is t else None)
+
+def stop_round_timer(session_id: str):
+    task = session_timers.pop(session_id, None)
+    if task is not None:
+        task.cancel()
+
+async def deliver(session_id: str, message: dict, to: str = None):
+    """Queue a published message for the matching websockets connected to this worker."""
+    broadcaster.send(session_id, message, to)
+    if message.get('type') == 'room_ended':
+        broadcaster.close_session(session_id)
+
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
-    await websocket.accept()
+    # Clients that do not ask for a wordrush.v2 subprotocol (game.html) get the original full-JSON messages
+    codec = protocol.negotiate(websocket.scope.get('subprotocols', []))
+    await websocket.accept(subprotocol=codec.subprotocol)
     player_id = generate_player_id()
-    if session_id not in multiplayer_sessions:
-        multiplayer_sessions[session_id] = {
-            'players': {},
-            'round_data': generate_round(),
-            'votes': {},
-            'time_left': 120
-        }
-    multiplayer_sessions[session_id]['players'][player_id] = {
-        'score': 0,
-        'answers': None,
-        'websocket': websocket,
-        'name': f"Player_{player_id[:3]}"  # Simple name for chat
-    }
+
+    def join(session):
+        rooms.admit(session, player_id, {
+            'score': 0,
+            'answers': None,
+            'name': f"Player_{player_id[:3]}"  # Simple name for chat
+        })
+        if session['round_deadline'] is None:
+            session['round_deadline'] = time.time() + ROUND_SECONDS
+        return timer_message(session)
+
+    try:
+        timer_update = await multiplayer_sessions.update(session_id, join)
+        if timer_update is None:
+            raise RoomError("No game with this code")
+    except RoomError as e:
+        frame = codec.encode({'type': 'error', 'detail': str(e)})
+        await (websocket.send_bytes(frame) if isinstance(frame, bytes) else websocket.send_text(frame))
+        await websocket.close(code=4000)
+        return
+    broadcaster.add(session_id, player_id, websocket, codec)
+    ensure_round_timer(session_id)
     # Sync timer for new player
-    await websocket.send_text(json.dumps({
-        'type': 'timer_update',
-        'time_left': multiplayer_sessions[session_id]['time_left']
-    }))
+    broadcaster.send(session_id, timer_update, to=player_id)
+    WS_CONNECTIONS.inc('opened', codec.name)
     try:
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            data = await websocket.receive()
+            if data['type'] == 'websocket.disconnect':
+                raise WebSocketDisconnect(data.get('code', 1000))
+            start = time.perf_counter()
+            message = codec.decode(data['text'] if data.get('text') is not None else data['bytes'])
             if message['type'] == 'submit_answers':
                 answers = message['answers']
-                multiplayer_sessions[session_id]['players'][player_id]['answers'] = answers
-                if all(p['answers'] is not None for p in multiplayer_sessions[session_id]['players'].values()):
-                    round_data = multiplayer_sessions[session_id]['round_data']
-                    players_answers = {pid: p['answers'] for pid, p in multiplayer_sessions[session_id]['players'].items()}
-                    validation_results = validate_multiplayer_answers(players_answers, round_data["letter"])
-                    scores = calculate_multiplayer_scores(players_answers, round_data)
-                    for pid, player in multiplayer_sessions[session_id]['players'].items():
-                        player_score = scores[pid]
-                        player['score'] += player_score
-                        await player['websocket'].send_text(json.dumps({
-                            'type': 'round_results',
-                            'results': validation_results[pid],
-                            'round_score': player_score,
-                            'total_score': player['score']
-                        }))
-                    for player in multiplayer_sessions[session_id]['players'].values():
-                        player['answers'] = None
-                    multiplayer_sessions[session_id]['round_data'] = generate_round()
-                    multiplayer_sessions[session_id]['time_left'] = 120
+                round_id = message.get('round_id')
+                current_round_id = None
+
+                def submit(session):
+                    nonlocal current_round_id
+                    # Answers for a round the clock has already closed must not count for the next one
+                    if round_id != session['round_data'].get('round_id'):
+                        current_round_id = session['round_data'].get('round_id')
+                        return None
+                    session['players'][player_id]['answers'] = answers
+                    touch(session)
+                    return claim_round(session)
+
+                finished = await multiplayer_sessions.update(session_id, submit)
+                if finished:
+                    await finish_round(session_id, *finished)
+                elif current_round_id is not None:
+                    broadcaster.send(session_id, {
+                        'type': 'error',
+                        'detail': "That round has already ended, so these answers were not counted",
+                        'round_id': current_round_id
+                    }, to=player_id)
             elif message['type'] == 'vote':
                 category = message['category']
-                multiplayer_sessions[session_id]['votes'][category] = True
+                def add_vote(session):
+                    session['votes'][category] = True
+                    touch(session)
+
+                await multiplayer_sessions.update(session_id, add_vote)
                 await broadcast_vote(session_id, player_id, category)
             elif message['type'] == 'chat_message':
-                for player in multiplayer_sessions[session_id]['players'].values():
-                    await player['websocket'].send_text(json.dumps({
-                        'type': 'chat_message',
-                        'player': multiplayer_sessions[session_id]['players'][player_id]['name'],
-                        'message': message['message']
-                    }))
-            # Simplified timer sync (full sync would require a separate loop)
-            multiplayer_sessions[session_id]['time_left'] -= 1
-            if multiplayer_sessions[session_id]['time_left'] >= 0:
-                for player in multiplayer_sessions[session_id]['players'].values():
-                    await player['websocket'].send_text(json.dumps({
-                        'type': 'timer_update',
-                        'time_left': multiplayer_sessions[session_id]['time_left']
-                    }))
-            if multiplayer_sessions[session_id]['time_left'] <= 0:
-                if all(p['answers'] is not None for p in multiplayer_sessions[session_id]['players'].values()):
-                    round_data = multiplayer_sessions[session_id]['round_data']
-                    players_answers = {pid: p['answers'] for pid, p in multiplayer_sessions[session_id]['players'].items()}
-                    validation_results = validate_multiplayer_answers(players_answers, round_data["letter"])
-                    scores = calculate_multiplayer_scores(players_answers, round_data)
-                    for pid, player in multiplayer_sessions[session_id]['players'].items():
-                        player_score = scores[pid]
-                        player['score'] += player_score
-                        await player['websocket'].send_text(json.dumps({
-                            'type': 'round_results',
-                            'results': validation_results[pid],
-                            'round_score': player_score,
-                            'total_score': player['score']
-                        }))
-                    for player in multiplayer_sessions[session_id]['players'].values():
-                        player['answers'] = None
-                    multiplayer_sessions[session_id]['round_data'] = generate_round()
-                    multiplayer_sessions[session_id]['time_left'] = 120
+                session_data = await multiplayer_sessions.get(session_id)
+                await multiplayer_sessions.publish(session_id, {
+                    'type': 'chat_message',
+                    'player': session_data['players'][player_id]['name'],
+                    'message': message['message']
+                })
+            message_type = message['type'] if message['type'] in WS_MESSAGE_TYPES else 'other'
+            WS_MESSAGE_SECONDS.observe(time.perf_counter() - start, message_type)
     except WebSocketDisconnect:
-        del multiplayer_sessions[session_id]['players'][player_id]
-        await broadcast_player_left(session_id, player_id)
-        if not multiplayer_sessions[session_id]['players']:
-            del multiplayer_sessions[session_id]
+        pass
+    except RuntimeError:
+        # Socket closed by the broadcaster after a send failure or overflow; anything else is a real error
+        if WebSocketState.DISCONNECTED not in (websocket.application_state, websocket.client_state):
+            raise
+    finally:
+        WS_CONNECTIONS.inc('closed', codec.name)
+        if await broadcaster.remove(session_id, player_id):
+            stop_round_timer(session_id)
+
+        def leave(session):
+            session['players'].pop(player_id, None)
+            touch(session)
+            return True
+
+        # Empty rooms are kept for reconnects (e.g. "Next Round" reloads the page); the room sweeper ends them
+        if await multiplayer_sessions.update(session_id, leave):
+            await broadcast_player_left(session_id, player_id)
 
 async def broadcast_answers(session_id: str, player_id: str, answers: dict):
-    for player in multiplayer_sessions[session_id]['players'].values():
-        await player['websocket'].send_text(json.dumps({
-            'type': 'answers_submitted',
-            'player_id': player_id,
-            'answers': answers
-        }))
+    await multiplayer_sessions.publish(session_id, {
+        'type': 'answers_submitted',
+        'player_id': player_id,
+        'answers': answers
+    })
 
 async def broadcast_vote(session_id: str, player_id: str, category: str):
-    for player in multiplayer_sessions[session_id]['players'].values():
-        await player['websocket'].send_text(json.dumps({
-            'type': 'vote_accepted',
-            'player_id': player_id,
-            'category': category
-        }))
+    await multiplayer_sessions.publish(session_id, {
+        'type': 'vote_accepted',
+        'player_id': player_id,
+        'category': category
+    })
 
 async def broadcast_player_left(session_id: str, player_id: str):
-    for player in multiplayer_sessions[session_id]['players'].values():
-        await player['websocket'].send_text(json.dumps({
-            'type': 'player_left',
-            'player_id': player_id
-        }))
+    await multiplayer_sessions.publish(session_id, {
+        'type': 'player_left',
+        'player_id': player_id
+    })
 
 @app.get("/test")
 async def test_endpoint():
     return {"status": "success", "detail": "Test endpoint is working!"}
 
+@app.get("/stats")
+async def stats():
+    return {
+        "rooms": await rooms.stats(),
+        "broadcast": broadcaster.snapshot(),
+        "verdict_cache": verdict_cache.stats(),
+        "coalescer": coalescer.stats(),
+        "score_writer": score_writer.stats(),
+        "round_pool": round_pool.stats(),
+        "page_cache": pages.stats(),
+        "round_log": round_log.stats()
+    }
+
+@app.get("/api/rooms")
+async def rooms_api():
+    return await rooms.report()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus scrape endpoint. Values are per worker process."""
+    return PlainTextResponse(await metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/add_score/{player_name}/{score}")
 async def add_score(player_name: str, score: int):
-    db = SessionLocal()
-    new_score = Score(player_name=player_name, score=score)
-    db.add(new_score)
-    db.commit()
-    db.refresh(new_score)
-    db.close()
+    await score_writer.submit(player_name, score)
     return {"status": "success", "player_name": player_name, "score": score}
 
 @app.get("/validate/{category}/{letter}/{word}")
 async def validate(category: str, letter: str, word: str):
-    result = validate_word([(category, letter, word)])
+    result = await validate_word_async([(category, letter, word)])
     is_valid, explanation, _ = result[category]
     return {"category": category, "letter": letter, "word": word, "is_valid": is_valid, "explanation": explanation}
 
 @app.get("/leaderboard", response_class=HTMLResponse)
-async def leaderboard(request: Request):
-    db = SessionLocal()
-    scores = db.query(Score).order_by(Score.score.desc()).limit(10).all()
-    db.close()
-    return templates.TemplateResponse("leaderboard.html", {"request": request, "scores": scores})
\ No newline at end of file
+async def leaderboard(request: Request, window: str = "all", page: int = Query(1, ge=1)):
+    if window not in WINDOWS:
+        window = "all"
+
+    def context():
+        board = leaderboard_cache.page(window, page)
+        return {
+            "scores": board["scores"],
+            "window": window,
+            "windows": WINDOWS,
+            "page": page,
+            "has_next": board["has_next"]
+        }
+
+    # Cached copies are dropped whenever a score write here bumps the leaderboard version, and expire
+    # after LEADERBOARD_CACHE_TTL so writes from other workers show up as soon as in /api/leaderboard
+    return pages.page(request, "leaderboard.html", context, key=(window, page), version=leaderboard_cache.version,
+                      ttl=LEADERBOARD_CACHE_TTL)
+
+@app.get("/api/leaderboard")
+async def leaderboard_api(window: str = "all", page: int = Query(1, ge=1), per_page: int = Query(10, ge=1, le=100)):
+    if window not in WINDOWS:
+        return {"status": "error", "detail": f"window must be one of {', '.join(WINDOWS)}"}
+    return leaderboard_cache.page(window, page, per_page)
+
+@app.get("/api/players")
+async def players_api(order_by: str = "best", page: int = Query(1, ge=1), per_page: int = Query(10, ge=1, le=100)):
+    if order_by not in ("best", "total", "games"):
+        return {"status": "error", "detail": "order_by must be one of best, total, games"}
+    return leaderboard_cache.players(order_by, page, per_page)
+
+@app.get("/api/players/{player_name}")
+async def player_api(player_name: str):
+    stats = leaderboard_cache.player(player_name)
+    if stats is None:
+        return {"status": "error", "detail": f"No scores recorded for {player_name}"}
+    return stats
\ No newline at end of file
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from markupsafe import Markup
+from starlette.responses import HTMLResponse, Response
+from starlette.staticfiles import StaticFiles
+
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "1024"))
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def not_modified(request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+@lru_cache(maxsize=None)
+def static_url(path: str) -> str:
+    """URL of a file under static/, versioned by its content so it can be cached indefinitely."""
+    with open(os.path.join(STATIC_DIR, path), "rb") as f:
+        version = hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+    return f"/static/{path}?v={version}"
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles (which already answers If-None-Match) plus Cache-Control: versioned URLs never change."""
+
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            if b"v=" in scope.get("query_string", b""):
+                response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+            else:
+                response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+class PageCache:
+    """
+    Rendered HTML pages and fragments, keyed by template and a caller-chosen
+    key, in an LRU of `max_entries`. Every page is served with an ETag and
+    answered with 304 Not Modified when the client already has it. Pages
+    rendered with a `version` (e.g. the leaderboard's) drop all cached copies
+    of that template when the version changes; pages rendered with a `ttl`
+    are re-rendered once they are that many seconds old.
+    """
+
+    def __init__(self, env, max_entries: int = PAGE_CACHE_SIZE):
+        self.env = env
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._entries = OrderedDict()  # (template, key) -> (body, etag, expires_at or None)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, name: str, key, render, ttl=None):
+        if key is None:
+            body = render()
+            return body, etag_for(body)
+        cache_key = (name, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and (entry[2] is None or entry[2] > now):
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[:2]
+            self.misses += 1
+        body = render()
+        entry = (body, etag_for(body), now + ttl if ttl is not None else None)
+        with self._lock:
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry[:2]
+
+    def invalidate(self, name: str | None = None):
+        """Drop the cached copies of one template, or of everything."""
+        with self._lock:
+            for cache_key in [k for k in self._entries if name is None or k[0] == name]:
+                del self._entries[cache_key]
+
+    def page(self, request, name: str, context, key=None, version=None, ttl=None) -> Response:
+        """
+        Render `name` with `context`, or reuse the copy cached under `key`
+        (pass None for pages that are never the same twice). `context` may be
+        a function, called only when the page has to be rendered. `ttl` bounds
+        how long a cached copy is served, for pages that other processes can
+        change without bumping `version`.
+        """
+        if version is not None and self._versions.get(name) != version:
+            self.invalidate(name)
+            self._versions[name] = version
+
+        def render():
+            return self.env.get_template(name).render(context() if callable(context) else context).encode("utf-8")
+
+        body, etag = self._cached(name, key, render, ttl)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if not_modified(request, etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(body, headers=headers)
+
+    def fragment(self, name: str, key, **context) -> Markup:
+        """Render a fragment template, or reuse the copy cached under `key`."""
+        body, _ = self._cached(name, key, lambda: self.env.get_template(name).render(context).encode("utf-8"))
+        return Markup(body.decode("utf-8"))
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": sum(len(entry[0]) for entry in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
@@ -0,0 +1,146 @@
+import json
+import time
+
+try:
+    import msgpack
+except ImportError:  # Optional; without it only the JSON encodings are offered
+    msgpack = None
+
+PROTOCOL_VERSION = 2
+JSON_SUBPROTOCOL = "wordrush.v2.json"
+MSGPACK_SUBPROTOCOL = "wordrush.v2.msgpack"
+
+TYPE_CODES = {
+    "timer_update": "tm",
+    "round_results": "rr",
+    "scoreboard": "sb",
+    "chat_message": "ch",
+    "vote_accepted": "va",
+    "player_left": "pl",
+    "answers_submitted": "as",
+    "room_ended": "re",
+    "error": "er",
+    "submit_answers": "sa",
+    "vote": "vo",
+}
+KEY_CODES = {
+    "type": "t",
+    "round_deadline": "dl",
+    "server_time": "now",
+    "results": "r",
+    "round_score": "rs",
+    "total_score": "ts",
+    "scores": "s",
+    "removed": "rm",
+    "player": "p",
+    "player_id": "id",
+    "message": "m",
+    "category": "c",
+    "answers": "a",
+    "detail": "d",
+    "reason": "why",
+    "round_id": "rid",
+}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+KEY_NAMES = {code: name for name, code in KEY_CODES.items()}
+
+
+def compact(message: dict) -> dict:
+    """
+    The version 2 form of a message: short type codes and keys, per-category
+    results as [is_valid, points, explanation] (the client knows its own
+    answers), and timer updates as the round deadline plus the server clock,
+    which clients count down from themselves.
+    """
+    message = dict(message)
+    message_type = message.get("type")
+    if message_type == "timer_update":
+        message.pop("time_left", None)
+        message["server_time"] = round(time.time(), 3)
+    elif message_type == "round_results":
+        message["results"] = {
+            category: [int(result["is_valid"]), result["points"], result["explanation"]]
+            for category, result in message["results"].items()
+        }
+    elif message_type == "scoreboard":
+        message["scores"] = {pid: [entry["name"], entry["score"]] for pid, entry in message["scores"].items()}
+    message["type"] = TYPE_CODES.get(message_type, message_type)
+    return {KEY_CODES.get(key, key): value for key, value in message.items()}
+
+
+def expand(message: dict) -> dict:
+    """Inverse of compact, for messages from version 2 clients (and for test clients reading ours)."""
+    message = {KEY_NAMES.get(key, key): value for key, value in message.items()}
+    message["type"] = TYPE_NAMES.get(message.get("type"), message.get("type"))
+    if message["type"] == "round_results":
+        message["results"] = {
+            category: {"answer": "", "is_valid": bool(valid), "points": points, "explanation": explanation, "voted": False}
+            for category, (valid, points, explanation) in message["results"].items()
+        }
+    elif message["type"] == "scoreboard":
+        message["scores"] = {pid: {"name": name, "score": score} for pid, (name, score) in message["scores"].items()}
+    elif message["type"] == "timer_update":
+        message["time_left"] = max(0, round(message["round_deadline"] - message["server_time"]))
+    return message
+
+
+class Codec:
+    """
+    Version 1: full JSON text frames, as game.html expects. Every message is
+    sent as is, including periodic timer resyncs and whole scoreboards.
+    """
+
+    name = "v1"
+    subprotocol = None
+    deltas = False
+
+    def encode(self, message: dict):
+        return json.dumps(message)
+
+    def decode(self, data) -> dict:
+        return json.loads(data)
+
+
+class CompactJSONCodec(Codec):
+    """Version 2 with short-key JSON text frames. Timer updates and scoreboards are sent as deltas."""
+
+    name = "v2.json"
+    subprotocol = JSON_SUBPROTOCOL
+    deltas = True
+
+    def encode(self, message):
+        return json.dumps(compact(message), separators=(",", ":"))
+
+    def decode(self, data):
+        return expand(json.loads(data))
+
+
+class MsgpackCodec(Codec):
+    """Version 2 with msgpack binary frames."""
+
+    name = "v2.msgpack"
+    subprotocol = MSGPACK_SUBPROTOCOL
+    deltas = True
+
+    def encode(self, message):
+        return msgpack.packb(compact(message))
+
+    def decode(self, data):
+        return expand(msgpack.unpackb(data if isinstance(data, bytes) else data.encode()))
+
+
+V1 = Codec()
+CODECS = [CompactJSONCodec()] + ([MsgpackCodec()] if msgpack is not None else [])
+
+
+def negotiate(subprotocols) -> Codec:
+    """
+    Pick the codec for a websocket from the subprotocols its client offered,
+    in the client's order of preference. Clients that offer none of ours
+    (like game.html) get version 1.
+    """
+    by_name = {codec.subprotocol: codec for codec in CODECS}
+    for subprotocol in subprotocols:
+        if subprotocol in by_name:
+            return by_name[subprotocol]
+    return V1
@@ -0,0 +1,219 @@
+"""
+Replay the round log (see round_log.py) through the scoring and validation
+pipeline, e.g. to see what a change to the scoring rules in game_logic or to
+the validator prompt would have done to past rounds.
+
+The log is streamed in batches to a pool of worker processes. Each round is
+re-scored with verdicts taken from:
+
+  recorded  the verdicts logged with the round (tests scoring changes only)
+  cache     the lexicon and verdict cache, falling back to the logged verdict
+  validate  the full validator: lexicon and cache first, Gemini for the rest
+
+Every player whose score changed is written as a JSON line (old and new score,
+and the categories whose verdict flipped) to stdout or --diff-output, and a
+throughput summary is written to stderr.
+
+With --rebuild-scores the scores and player_stats tables are replaced by the
+re-scored single-player rounds, dated when they were played. Scores added
+through /add_score are not in the log and are dropped.
+
+    python replay.py wordrush_rounds.jsonl --verdicts cache --workers 4 --diff-output diffs.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from ai_validator import lookup_pairs, validate_pairs, normalize_word
+from game_logic import calculate_score, calculate_multiplayer_scores
+from round_log import ROUND_LOG_PATH, read_entry, iter_lines
+
+VERDICT_SOURCES = ("recorded", "cache", "validate")
+PROGRESS_INTERVAL = 5.0
+
+
+def _fresh_verdicts(rounds: list[dict], source: str) -> dict:
+    """
+    Verdicts for every answer in a batch of rounds, as (verdict, source)
+    keyed by (letter, category, normalized word): the starting-letter check
+    depends on the round's letter, so pairs are looked up one letter at a time.
+    """
+    by_letter = {}
+    for entry in rounds:
+        letter = entry["round_data"]["letter"]
+        for answers in entry["players_answers"].values():
+            by_letter.setdefault(letter, []).extend((category, letter, answer) for category, answer in answers.items())
+    fresh = {}
+    for letter, pairs in by_letter.items():
+        verdicts, misses = lookup_pairs(pairs)
+        for (category, word), verdict in verdicts.items():
+            fresh[(letter, category, word)] = (verdict, "cached")
+        if source == "validate" and misses:
+            for (category, word), verdict in validate_pairs(misses).items():
+                fresh[(letter, category, word)] = (verdict, "validated")
+    return fresh
+
+
+def replay_batch(lines: list[str], source: str) -> tuple[list[dict], dict]:
+    """
+    Re-score a batch of log lines. Returns one result per round (its players'
+    old and new scores and flipped categories) and the batch's counters.
+    Runs in a worker process.
+    """
+    counts = {"rounds": 0, "bad_lines": 0, "players": 0, "pairs": 0, "recorded": 0, "cached": 0, "validated": 0}
+    rounds = []
+    for line in lines:
+        try:
+            rounds.append(read_entry(line))
+        except (ValueError, KeyError, TypeError, IndexError):
+            counts["bad_lines"] += 1
+    fresh = _fresh_verdicts(rounds, source) if source != "recorded" else {}
+
+    results = []
+    for entry in rounds:
+        round_data = entry["round_data"]
+        letter = round_data["letter"]
+        recorded = entry["verdicts"]
+        verdicts = dict(recorded)
+        pairs = {(category, normalize_word(answer)) for answers in entry["players_answers"].values() for category, answer in answers.items()}
+        for key in pairs:
+            verdict, origin = fresh.get((letter, *key), (None, "recorded"))
+            if verdict is not None:
+                verdicts[key] = verdict
+            counts[origin] += 1
+
+        if entry["mode"] == "multi":
+            new_scores = calculate_multiplayer_scores(entry["players_answers"], round_data, verdicts)
+        else:
+            new_scores = {pid: calculate_score(answers, round_data, verdicts) for pid, answers in entry["players_answers"].items()}
+        players = []
+        for pid, answers in entry["players_answers"].items():
+            flipped = [
+                category for category, answer in answers.items()
+                if verdicts.get((category, normalize_word(answer)), (False, ""))[0]
+                != recorded.get((category, normalize_word(answer)), (False, ""))[0]
+            ]
+            players.append([pid, entry["names"][pid], entry["scores"][pid], new_scores.get(pid, 0), flipped])
+        results.append({"ts": entry["ts"], "mode": entry["mode"], "round_id": round_data["round_id"], "players": players})
+        counts["rounds"] += 1
+        counts["players"] += len(players)
+        counts["pairs"] += len(pairs)
+    return results, counts
+
+
+def _batches(lines, size: int):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def replay(path: str, source: str = "recorded", workers: int = 1, batch_size: int = 500):
+    """
+    Yield (results, counts) per batch of the log at `path`, in log order.
+    At most two batches per worker are in flight, so memory stays bounded
+    however long the log is. With workers <= 1 batches run in this process.
+    """
+    batches = _batches(iter_lines(path), batch_size)
+    if workers <= 1:
+        for batch in batches:
+            yield replay_batch(batch, source)
+        return
+    # Spawned rather than forked: each worker opens its own verdict cache connection, since an
+    # SQLite connection inherited across fork must not be used
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(pool.submit(replay_batch, batch, source))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def rebuild_scores(rows: list[tuple[str, int, datetime]]) -> int:
+    """Replace the scores and player_stats tables with `rows` of (player_name, score, created_at), in one transaction."""
+    from database import engine, init_db, backfill_player_stats, Score, PlayerStats
+
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(Score.__table__.delete())
+        conn.execute(PlayerStats.__table__.delete())
+        for start in range(0, len(rows), 1000):
+            conn.execute(Score.__table__.insert(), [
+                {"player_name": name, "score": score, "created_at": created_at}
+                for name, score, created_at in rows[start:start + 1000]
+            ])
+        backfill_player_stats(conn)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", nargs="?", default=ROUND_LOG_PATH, help=f"round log to replay (default {ROUND_LOG_PATH})")
+    parser.add_argument("--verdicts", default="recorded", choices=VERDICT_SOURCES, help="where verdicts come from")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (1 runs in this process)")
+    parser.add_argument("--batch-size", type=int, default=500, help="rounds per batch")
+    parser.add_argument("--diff-output", help="write score diffs here instead of stdout")
+    parser.add_argument("--rebuild-scores", action="store_true",
+                        help="replace the scores table (DATABASE_URL) with the re-scored single-player rounds")
+    args = parser.parse_args()
+
+    totals = {"rounds": 0, "bad_lines": 0, "players": 0, "pairs": 0, "recorded": 0, "cached": 0, "validated": 0,
+              "rounds_changed": 0, "players_changed": 0, "score_delta": 0}
+    # Kept until the replay is done, so the database is only locked for the rewrite itself
+    rows = []
+    out = open(args.diff_output, "w", encoding="utf-8") if args.diff_output else sys.stdout
+    start = last_progress = time.perf_counter()
+    try:
+        for results, counts in replay(args.log, args.verdicts, args.workers, args.batch_size):
+            for field, value in counts.items():
+                totals[field] += value
+            for result in results:
+                changed = False
+                for pid, name, old, new, flipped in result["players"]:
+                    if args.rebuild_scores and result["mode"] != "multi":
+                        rows.append((name, new, datetime.fromtimestamp(result["ts"], timezone.utc).replace(tzinfo=None)))
+                    if new == old and not flipped:
+                        continue
+                    changed = True
+                    totals["players_changed"] += 1
+                    totals["score_delta"] += new - old
+                    out.write(json.dumps({
+                        "ts": result["ts"],
+                        "round_id": result["round_id"],
+                        "mode": result["mode"],
+                        "player_id": pid,
+                        "player": name,
+                        "old": old,
+                        "new": new,
+                        "flipped": flipped,
+                    }) + "\n")
+                totals["rounds_changed"] += changed
+            now = time.perf_counter()
+            if now - last_progress >= PROGRESS_INTERVAL:
+                last_progress = now
+                print(f"{totals['rounds']} rounds, {totals['rounds'] / (now - start):.0f}/s", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    if args.rebuild_scores:
+        totals["scores_rebuilt"] = rebuild_scores(rows)
+    totals["elapsed_seconds"] = round(elapsed, 3)
+    totals["rounds_per_second"] = round(totals["rounds"] / elapsed, 1) if elapsed else 0.0
+    print(json.dumps(totals, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
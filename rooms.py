@@ -0,0 +1,208 @@
+import asyncio
+import os
+import secrets
+import time
+
+# No 0/O or 1/I, so codes can be read out and typed in
+ROOM_ID_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+ROOM_ID_LENGTH = int(os.getenv("ROOM_ID_LENGTH", "6"))
+MAX_ROOMS = int(os.getenv("MAX_ROOMS", "1000"))
+MAX_PLAYERS_PER_ROOM = int(os.getenv("MAX_PLAYERS_PER_ROOM", "8"))
+# Rooms nobody has joined yet are capped separately; the oldest makes way for a new one
+MAX_PENDING_ROOMS = int(os.getenv("MAX_PENDING_ROOMS", "200"))
+# Rooms nobody ever joined
+ROOM_CREATED_TTL = float(os.getenv("ROOM_CREATED_TTL", "300"))
+# Rooms whose players all left, e.g. while navigating to the next round
+ROOM_EMPTY_TTL = float(os.getenv("ROOM_EMPTY_TTL", "120"))
+# Rooms with players but no activity, e.g. left behind by a crashed worker
+ROOM_IDLE_TTL = float(os.getenv("ROOM_IDLE_TTL", "1800"))
+# How long an ended room is kept so late joiners are told it ended
+ROOM_ENDED_TTL = float(os.getenv("ROOM_ENDED_TTL", "60"))
+ROOM_SWEEP_INTERVAL = float(os.getenv("ROOM_SWEEP_INTERVAL", "30"))
+
+
+class RoomError(Exception):
+    """Raised when a room cannot be created or joined."""
+
+
+def touch(room: dict):
+    room['last_active'] = time.time()
+
+
+class RoomManager:
+    """
+    Lifecycle of the multiplayer rooms kept in a SessionStore.
+
+    A room is `created` when its ID is allocated, `active` once a player has
+    joined, and `ended` when a sweep finds it idle; ended rooms are deleted
+    after ROOM_ENDED_TTL. IDs are drawn at random and claimed with the store's
+    atomic create, so two workers can never hand out the same ID. The number
+    of rooms and of players per room is capped. Rooms still `created` do not
+    count against `max_rooms`: at most `max_pending` of them are kept, and
+    the oldest is dropped to make way for a new one, so page loads that never
+    join (e.g. crawlers) cannot lock out new games.
+    """
+
+    def __init__(self, store, new_round, max_rooms: int = MAX_ROOMS, max_players: int = MAX_PLAYERS_PER_ROOM,
+                 max_pending: int = MAX_PENDING_ROOMS, sweep_interval: float = ROOM_SWEEP_INTERVAL):
+        self.store = store
+        self.new_round = new_round
+        self.max_rooms = max_rooms
+        self.max_players = max_players
+        self.max_pending = max_pending
+        self.sweep_interval = sweep_interval
+        self.allocated = 0
+        self.collisions = 0
+        self.rejected = 0
+        self.evicted = {'created': 0, 'empty': 0, 'idle': 0, 'displaced': 0}
+        self._task = None
+
+    def new_room(self) -> dict:
+        now = time.time()
+        return {
+            'state': 'created',
+            'created_at': now,
+            'last_active': now,
+            'ended_at': None,
+            'players': {},
+            'round_data': self.new_round(),
+            'votes': {},
+            'round_deadline': None  # Set when the first player joins
+        }
+
+    async def allocate(self) -> str:
+        """Create a room under a fresh ID and return the ID."""
+        pending = await self.store.count_in_state('created')
+        if await self.store.count() - pending >= self.max_rooms:
+            self.rejected += 1
+            raise RoomError("Too many games in progress, try again in a minute")
+        if pending >= self.max_pending:
+            await self._displace_oldest_pending(pending)
+        room = self.new_room()
+        for _ in range(10):
+            room_id = ''.join(secrets.choice(ROOM_ID_ALPHABET) for _ in range(ROOM_ID_LENGTH))
+            if await self.store.create(room_id, room):
+                self.allocated += 1
+                return room_id
+            self.collisions += 1
+        raise RoomError("Could not allocate a room ID")
+
+    async def _displace_oldest_pending(self, pending: int):
+        for room_id in await self.store.oldest_in_state('created', pending - self.max_pending + 1):
+            # The predicate re-checks in case someone joined meanwhile
+            if await self.store.delete_if(room_id, lambda r: r.get('state') == 'created'):
+                self.evicted['displaced'] += 1
+
+    async def open(self, room_id: str) -> dict | None:
+        """The room's state, or None if it does not exist or has ended."""
+        room = await self.store.get(room_id)
+        if room is None or room.get('state') == 'ended':
+            return None
+        return room
+
+    def admit(self, room: dict, player_id: str, player: dict):
+        """
+        Add a player to the room state; call inside a store update.
+        Raises RoomError if the room has ended or is full.
+        """
+        if room.get('state') == 'ended':
+            raise RoomError("This game has ended")
+        if player_id not in room['players'] and len(room['players']) >= self.max_players:
+            raise RoomError(f"This game is full ({self.max_players} players)")
+        room['players'][player_id] = player
+        room['state'] = 'active'
+        touch(room)
+
+    def _expired(self, room: dict, now: float) -> str | None:
+        """Why the room should be ended now, or None."""
+        idle = now - (room.get('last_active') or 0)
+        if room.get('state') == 'created':
+            return 'created' if idle > ROOM_CREATED_TTL else None
+        if room.get('state') == 'active':
+            if not room['players'] and idle > ROOM_EMPTY_TTL:
+                return 'empty'
+            if idle > ROOM_IDLE_TTL:
+                return 'idle'
+        return None
+
+    async def sweep(self) -> int:
+        """End idle rooms and delete long-ended ones. Returns the number of rooms ended or deleted."""
+        now = time.time()
+        changed = 0
+        # Summaries have a player count instead of the players, which is all _expired looks at
+        for room in await self.store.summaries():
+            room_id = room['id']
+            if room['state'] == 'ended':
+                if now - (room['ended_at'] or 0) > ROOM_ENDED_TTL:
+                    changed += await self.store.delete_if(room_id, lambda r: r.get('state') == 'ended')
+                continue
+            reason = self._expired(room, now)
+            if reason == 'created':
+                # Nobody to tell; the predicate re-checks in case someone joined meanwhile
+                if await self.store.delete_if(room_id, lambda r: self._expired(r, time.time()) == 'created'):
+                    self.evicted[reason] += 1
+                    changed += 1
+            elif reason:
+                if await self.store.update(room_id, self._end_if_expired):
+                    self.evicted[reason] += 1
+                    changed += 1
+                    await self.store.publish(room_id, {'type': 'room_ended', 'reason': reason})
+        return changed
+
+    def _end_if_expired(self, room: dict) -> bool:
+        if room.get('state') == 'ended' or self._expired(room, time.time()) is None:
+            return False
+        room['state'] = 'ended'
+        room['ended_at'] = time.time()
+        return True
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"Error sweeping rooms: {e}")
+
+    async def report(self) -> list[dict]:
+        """Per-room state, player count, idle time and approximate memory (serialized state size)."""
+        now = time.time()
+        return [{
+            'id': room['id'],
+            'state': room['state'],
+            'players': room['players'],
+            'idle_seconds': round(now - (room['last_active'] or now), 1),
+            'bytes': room['bytes'],
+        } for room in await self.store.summaries()]
+
+    async def stats(self) -> dict:
+        totals = await self.store.totals()
+        states = {'created': 0, 'active': 0, 'ended': 0}
+        for state, total in totals.items():
+            states[state] = total['rooms']
+        return {
+            'rooms': sum(total['rooms'] for total in totals.values()),
+            **states,
+            'players': sum(total['players'] for total in totals.values()),
+            'bytes': sum(total['bytes'] for total in totals.values()),
+            'bytes_max': max((total['bytes_max'] for total in totals.values()), default=0),
+            'allocated': self.allocated,
+            'collisions': self.collisions,
+            'rejected': self.rejected,
+            'evicted_created': self.evicted['created'],
+            'evicted_empty': self.evicted['empty'],
+            'evicted_idle': self.evicted['idle'],
+            'evicted_displaced': self.evicted['displaced'],
+        }
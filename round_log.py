@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+from ai_validator import normalize_word
+
+ROUND_LOG_PATH = os.getenv("ROUND_LOG_PATH", "wordrush_rounds.jsonl")
+
+
+def round_entry(mode: str, round_data: dict, players: dict) -> dict:
+    """
+    The log entry for a finished round. `players` maps player ID to
+    (name, per-category results as shown to the player, round score).
+
+    Entries are compact: answers are listed in category order ("" for no
+    answer) and each unique (category, word) verdict is stored once, as
+    [category index, normalized word, is_valid, explanation].
+    """
+    categories = round_data["categories"]
+    verdicts = {}
+    logged_players = {}
+    for player_id, (name, results, score) in players.items():
+        answers = []
+        for index, category in enumerate(categories):
+            result = results.get(category) or {}
+            answer = result.get("answer") or ""
+            answers.append(answer)
+            if answer:
+                verdicts.setdefault((index, normalize_word(answer)), (int(bool(result["is_valid"])), result["explanation"]))
+        logged_players[player_id] = [name, answers, score]
+    return {
+        "ts": round(time.time(), 3),
+        "m": mode,
+        "id": round_data.get("round_id", ""),
+        "l": round_data["letter"],
+        "c": categories,
+        "p": logged_players,
+        "v": [[index, word, valid, explanation] for (index, word), (valid, explanation) in verdicts.items()],
+    }
+
+
+def read_entry(line: str) -> dict:
+    """
+    Expand a log line into mode, ts, round_data, players_answers (by player
+    ID), names (by player ID), scores (by player ID) and verdicts keyed by
+    (category, normalized word), as game_logic expects them.
+    """
+    entry = json.loads(line)
+    categories = entry["c"]
+    players = entry["p"]
+    return {
+        "ts": entry["ts"],
+        "mode": entry["m"],
+        "round_data": {"letter": entry["l"], "categories": categories, "round_id": entry["id"]},
+        "players_answers": {
+            pid: {category: answer for category, answer in zip(categories, answers) if answer}
+            for pid, (_, answers, _) in players.items()
+        },
+        "names": {pid: name for pid, (name, _, _) in players.items()},
+        "scores": {pid: score for pid, (_, _, score) in players.items()},
+        "verdicts": {(categories[index], word): (bool(valid), explanation) for index, word, valid, explanation in entry["v"]},
+    }
+
+
+def iter_lines(path: str):
+    """Stream the log's non-empty lines without reading the whole file."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+class RoundLog:
+    """
+    Append-only log of finished rounds, one JSON line per round, for offline
+    replay and re-scoring (see replay.py). Each line goes out in a single
+    O_APPEND write, so workers sharing the file never interleave entries.
+    An empty path disables the log.
+    """
+
+    def __init__(self, path: str = ROUND_LOG_PATH):
+        self.path = path
+        self.rounds = 0
+        self.bytes = 0
+        self.errors = 0
+        self._fd = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def record(self, mode: str, round_data: dict, players: dict):
+        """Append a finished round; see round_entry for `players`. Never raises."""
+        if not self.path:
+            return
+        try:
+            line = (json.dumps(round_entry(mode, round_data, players), separators=(",", ":")) + "\n").encode("utf-8")
+            with self._lock:
+                os.write(self._open(), line)
+                self.rounds += 1
+                self.bytes += len(line)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error writing round log: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def stats(self) -> dict:
+        return {
+            "rounds": self.rounds,
+            "bytes": self.bytes,
+            "errors": self.errors,
+        }
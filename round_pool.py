@@ -0,0 +1,113 @@
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from game_logic import round_from_seed, ROUND_SEED_BITS
+
+ROUND_POOL_SIZE = int(os.getenv("ROUND_POOL_SIZE", "256"))
+ROUND_POOL_CANDIDATES = int(os.getenv("ROUND_POOL_CANDIDATES", "4"))
+ROUND_POOL_REFRESH = float(os.getenv("ROUND_POOL_REFRESH", "300"))
+# Known answers for a (category, letter) at which it counts as fully answerable
+ANSWERABLE_AT = 5
+
+
+class RoundPool:
+    """
+    Pool of pre-generated rounds. Every round is fully determined by its seed
+    (see game_logic.round_from_seed), so it can be reproduced from its round ID.
+    For each slot the pool draws several candidate seeds and keeps the round
+    whose categories have the most known answers for its letter, according to
+    `count_sources` (e.g. the lexicon and the verdict history). A background
+    task tops the pool up and periodically refreshes the answer counts.
+    """
+
+    def __init__(self, count_sources, size: int = ROUND_POOL_SIZE, candidates: int = ROUND_POOL_CANDIDATES,
+                 refresh_interval: float = ROUND_POOL_REFRESH):
+        self.count_sources = count_sources
+        self.size = size
+        self.candidates = candidates
+        self.refresh_interval = refresh_interval
+        self.served = 0
+        self.generated_on_demand = 0
+        self._counts = {}
+        self._counts_at = 0.0
+        self._pool = deque()
+        self._loop = None
+        self._wakeup = None
+        self._task = None
+
+    def refresh_counts(self):
+        counts = {}
+        for source in self.count_sources:
+            for key, count in source().items():
+                counts[key] = counts.get(key, 0) + count
+        self._counts = counts
+        self._counts_at = time.monotonic()
+
+    def answerability(self, round_data: dict) -> float:
+        """Between 0 (no known answers for any category) and 1 (plenty for every category)."""
+        letter = round_data["letter"].lower()
+        known = sum(min(self._counts.get((category.lower(), letter), 0), ANSWERABLE_AT) for category in round_data["categories"])
+        return known / (ANSWERABLE_AT * len(round_data["categories"]))
+
+    def _generate(self) -> dict:
+        rounds = [round_from_seed(random.getrandbits(ROUND_SEED_BITS)) for _ in range(self.candidates)]
+        return max(rounds, key=self.answerability)
+
+    def fill(self):
+        while len(self._pool) < self.size:
+            self._pool.append(self._generate())
+
+    def take(self) -> dict:
+        """
+        Next round from the pool; generated on the spot if the pool is empty.
+        Safe to call from other threads (e.g. inside a session store update).
+        """
+        self.served += 1
+        if self._pool:
+            round_data = self._pool.popleft()
+        else:
+            self.generated_on_demand += 1
+            round_data = self._generate()
+        if self._wakeup is not None and len(self._pool) < self.size // 2:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return round_data
+
+    async def start(self):
+        await asyncio.to_thread(self.refresh_counts)
+        self.fill()
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if time.monotonic() - self._counts_at >= self.refresh_interval:
+                try:
+                    await asyncio.to_thread(self.refresh_counts)
+                except Exception as e:
+                    print(f"Error refreshing round answer counts: {e}")
+            self.fill()
+
+    def stats(self) -> dict:
+        return {
+            "pooled": len(self._pool),
+            "served": self.served,
+            "generated_on_demand": self.generated_on_demand,
+            "mean_answerability": sum(map(self.answerability, self._pool)) / len(self._pool) if self._pool else 0.0,
+        }
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import time
+from metrics import Histogram
+
+SCORE_BATCH_SIZE = int(os.getenv("SCORE_BATCH_SIZE", "200"))
+SCORE_FLUSH_INTERVAL = float(os.getenv("SCORE_FLUSH_INTERVAL", "0.5"))
+SCORE_QUEUE_SIZE = int(os.getenv("SCORE_QUEUE_SIZE", "10000"))
+SCORE_FLUSH_RETRIES = int(os.getenv("SCORE_FLUSH_RETRIES", "3"))
+
+DB_WRITE_SECONDS = Histogram(
+    "wordrush_db_write_seconds", "Time to write and commit a batch of scores, by outcome.", ("outcome",))
+SCORE_BATCH_SIZES = Histogram(
+    "wordrush_score_batch_size", "Scores written per batch.", buckets=(1, 5, 10, 25, 50, 100, 200, 500))
+
+
+class ScoreWriter:
+    """
+    Write-behind queue for score inserts. Request handlers enqueue and return;
+    a background task flushes the queue in one transaction per batch, when
+    SCORE_BATCH_SIZE scores are waiting or SCORE_FLUSH_INTERVAL has passed,
+    running the database work in a thread so the event loop never blocks on it.
+    """
+
+    def __init__(self, leaderboard, session_factory, batch_size: int = SCORE_BATCH_SIZE,
+                 flush_interval: float = SCORE_FLUSH_INTERVAL, max_queue: int = SCORE_QUEUE_SIZE):
+        self.leaderboard = leaderboard
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.queued = 0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue(self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, player_name: str, score: int):
+        """Queue a score; waits only when the queue is full."""
+        if self._task is None or self._task.done():
+            # Not running (e.g. during shutdown): write through
+            await asyncio.to_thread(self._write, [(player_name, score)])
+            return
+        await self._queue.put((player_name, score))
+        self.queued += 1
+
+    async def stop(self):
+        """Flush everything still queued, then stop the background task."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            item = await self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if stopping:
+                # Drain whatever arrived before the stop marker was processed
+                while not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if item is not None:
+                        batch.append(item)
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch):
+        for attempt in range(SCORE_FLUSH_RETRIES):
+            try:
+                await asyncio.to_thread(self._write, batch)
+                return
+            except Exception as e:
+                self.failures += 1
+                print(f"Error writing {len(batch)} scores (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(0.1 * 2 ** attempt)
+        self.dropped += len(batch)
+
+    def _write(self, batch):
+        db = self.session_factory()
+        start = time.perf_counter()
+        try:
+            self.leaderboard.record(db, batch)
+        except Exception:
+            db.rollback()
+            DB_WRITE_SECONDS.observe(time.perf_counter() - start, "error")
+            raise
+        finally:
+            db.close()
+        DB_WRITE_SECONDS.observe(time.perf_counter() - start, "ok")
+        SCORE_BATCH_SIZES.observe(len(batch))
+        self.written += len(batch)
+        self.batches += 1
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "queued": self.queued,
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
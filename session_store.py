@@ -0,0 +1,367 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SESSION_STORE = os.getenv("SESSION_STORE", "sqlite")
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "wordrush_sessions.db")
+SESSION_STORE_POLL_INTERVAL = float(os.getenv("SESSION_STORE_POLL_INTERVAL", "0.05"))
+SESSION_STORE_MESSAGE_TTL = float(os.getenv("SESSION_STORE_MESSAGE_TTL", "60"))
+
+
+def _summary(session_id: str, data: dict, size: int) -> dict:
+    return {
+        'id': session_id,
+        'state': data.get('state', 'active'),
+        'created_at': data.get('created_at'),
+        'last_active': data.get('last_active'),
+        'ended_at': data.get('ended_at'),
+        'players': len(data.get('players') or {}),
+        'bytes': size,
+    }
+
+
+def _totals(summaries) -> dict:
+    totals = {}
+    for room in summaries:
+        state = totals.setdefault(room['state'], {'rooms': 0, 'players': 0, 'bytes': 0, 'bytes_max': 0})
+        state['rooms'] += 1
+        state['players'] += room['players']
+        state['bytes'] += room['bytes']
+        state['bytes_max'] = max(state['bytes_max'], room['bytes'])
+    return totals
+
+
+class SessionStore:
+    """
+    Storage for multiplayer room state plus pub/sub for room broadcasts.
+    Room state is a JSON-serializable dict (players, round_data, votes, ...);
+    live websockets stay in the worker that accepted them. Messages published
+    for a room are handed to the listener of every worker, which forwards them
+    to its own connections. Every operation is a coroutine, so backends that
+    block (on a lock or a file) can do so off the event loop.
+    """
+
+    async def get(self, session_id: str) -> dict | None:
+        """Return a snapshot of the room state, or None if the room does not exist."""
+        raise NotImplementedError
+
+    async def create(self, session_id: str, data: dict) -> bool:
+        """Create the room unless it already exists. Returns True if it was created."""
+        raise NotImplementedError
+
+    async def update(self, session_id: str, fn):
+        """
+        Atomically apply `fn` to the room state. `fn` mutates the dict in place
+        and its return value is passed through. Returns None if the room does
+        not exist. `fn` may run in another thread.
+        """
+        raise NotImplementedError
+
+    async def delete(self, session_id: str):
+        raise NotImplementedError
+
+    async def delete_if(self, session_id: str, predicate) -> bool:
+        """Atomically delete the room if `predicate(state)` is true. Returns True if it was deleted."""
+        raise NotImplementedError
+
+    async def session_ids(self) -> list[str]:
+        raise NotImplementedError
+
+    async def count(self) -> int:
+        return len(await self.session_ids())
+
+    async def count_in_state(self, state: str) -> int:
+        """Number of rooms whose 'state' field is `state`."""
+        rooms = [await self.get(session_id) for session_id in await self.session_ids()]
+        return sum(1 for room in rooms if (room or {}).get('state') == state)
+
+    async def summaries(self) -> list[dict]:
+        """
+        One dict per room with its id, state, created_at, last_active,
+        ended_at, number of players and serialized size in bytes, without
+        loading whole rooms one by one.
+        """
+        rooms = []
+        for session_id in await self.session_ids():
+            data = await self.get(session_id)
+            if data is not None:
+                rooms.append(_summary(session_id, data, len(json.dumps(data))))
+        return rooms
+
+    async def totals(self) -> dict:
+        """Per state: the number of rooms and players, total bytes and the largest room's bytes."""
+        return _totals(await self.summaries())
+
+    async def oldest_in_state(self, state: str, limit: int) -> list[str]:
+        """IDs of up to `limit` rooms whose 'state' field is `state`, oldest created first."""
+        rooms = [room for room in await self.summaries() if room['state'] == state]
+        return [room['id'] for room in sorted(rooms, key=lambda room: room['created_at'] or 0)[:limit]]
+
+    async def publish(self, session_id: str, message: dict, to: str | None = None):
+        """Broadcast `message` to the room, or only to player `to`, on every worker."""
+        raise NotImplementedError
+
+    async def start_listener(self, callback):
+        """Start delivering published messages to `await callback(session_id, message, to)`."""
+        raise NotImplementedError
+
+    async def stop_listener(self):
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """Single-process store; only correct when the app runs with one worker."""
+
+    def __init__(self):
+        self._sessions = {}
+        self._callback = None
+
+    async def get(self, session_id):
+        data = self._sessions.get(session_id)
+        return json.loads(json.dumps(data)) if data is not None else None
+
+    async def create(self, session_id, data):
+        if session_id in self._sessions:
+            return False
+        self._sessions[session_id] = data
+        return True
+
+    async def update(self, session_id, fn):
+        data = await self.get(session_id)
+        if data is None:
+            return None
+        # Applied to a copy, so a failing `fn` leaves the room as it was, as in the SQLite store
+        result = fn(data)
+        self._sessions[session_id] = data
+        return result
+
+    async def delete(self, session_id):
+        self._sessions.pop(session_id, None)
+
+    async def delete_if(self, session_id, predicate):
+        data = self._sessions.get(session_id)
+        if data is None or not predicate(data):
+            return False
+        del self._sessions[session_id]
+        return True
+
+    async def session_ids(self):
+        return list(self._sessions)
+
+    async def count(self):
+        return len(self._sessions)
+
+    async def count_in_state(self, state):
+        return sum(1 for data in self._sessions.values() if data.get('state') == state)
+
+    async def summaries(self):
+        return [_summary(session_id, data, len(json.dumps(data))) for session_id, data in self._sessions.items()]
+
+    async def publish(self, session_id, message, to=None):
+        if self._callback is not None:
+            await self._callback(session_id, message, to)
+
+    async def start_listener(self, callback):
+        self._callback = callback
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Store shared by all workers on a host through a WAL-mode SQLite file.
+    Updates run in IMMEDIATE transactions so concurrent workers serialize on
+    the room row, and broadcasts are appended to a message table that each
+    worker's listener polls. The database is only touched from one dedicated
+    thread, so waiting for another worker's write lock never stalls the event loop.
+    """
+
+    def __init__(self, path: str = SESSION_STORE_PATH, poll_interval: float = SESSION_STORE_POLL_INTERVAL,
+                 message_ttl: float = SESSION_STORE_MESSAGE_TTL):
+        self.poll_interval = poll_interval
+        self.message_ttl = message_ttl
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-store")
+        self._listener = None
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS session_messages ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, "
+            "recipient TEXT, payload TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _get(self, session_id):
+        row = self._db.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def get(self, session_id):
+        return await self._run(self._get, session_id)
+
+    def _create(self, session_id, data):
+        cursor = self._db.execute(
+            "INSERT OR IGNORE INTO sessions (id, data, updated_at) VALUES (?, ?, ?)",
+            (session_id, json.dumps(data), time.time()),
+        )
+        return cursor.rowcount == 1
+
+    async def create(self, session_id, data):
+        return await self._run(self._create, session_id, data)
+
+    def _update(self, session_id, fn):
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                self._db.execute("ROLLBACK")
+                return None
+            data = json.loads(row[0])
+            result = fn(data)
+            self._db.execute(
+                "UPDATE sessions SET data = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(data), time.time(), session_id),
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return result
+
+    async def update(self, session_id, fn):
+        return await self._run(self._update, session_id, fn)
+
+    def _delete(self, session_id):
+        self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    async def delete(self, session_id):
+        await self._run(self._delete, session_id)
+
+    def _delete_if(self, session_id, predicate):
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            deleted = row is not None and bool(predicate(json.loads(row[0])))
+            if deleted:
+                self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return deleted
+
+    async def delete_if(self, session_id, predicate):
+        return await self._run(self._delete_if, session_id, predicate)
+
+    def _session_ids(self):
+        return [row[0] for row in self._db.execute("SELECT id FROM sessions")]
+
+    async def session_ids(self):
+        return await self._run(self._session_ids)
+
+    def _count_in_state(self, state):
+        return self._db.execute(
+            "SELECT COUNT(*) FROM sessions WHERE json_extract(data, '$.state') = ?", (state,)
+        ).fetchone()[0]
+
+    async def count_in_state(self, state):
+        return await self._run(self._count_in_state, state)
+
+    # Room fields for summaries, read in SQL so /metrics scrapes and sweeps do not load every room
+    _SUMMARY_COLUMNS = (
+        "id, COALESCE(json_extract(data, '$.state'), 'active'), json_extract(data, '$.created_at'), "
+        "json_extract(data, '$.last_active'), json_extract(data, '$.ended_at'), "
+        "(SELECT COUNT(*) FROM json_each(data, '$.players')), length(data)"
+    )
+
+    def _summaries(self):
+        rows = self._db.execute(f"SELECT {self._SUMMARY_COLUMNS} FROM sessions").fetchall()
+        keys = ('id', 'state', 'created_at', 'last_active', 'ended_at', 'players', 'bytes')
+        return [dict(zip(keys, row)) for row in rows]
+
+    async def summaries(self):
+        return await self._run(self._summaries)
+
+    def _totals(self):
+        rows = self._db.execute(
+            "SELECT COALESCE(json_extract(data, '$.state'), 'active'), COUNT(*), "
+            "SUM((SELECT COUNT(*) FROM json_each(data, '$.players'))), SUM(length(data)), MAX(length(data)) "
+            "FROM sessions GROUP BY 1"
+        ).fetchall()
+        return {state: {'rooms': rooms, 'players': players, 'bytes': size, 'bytes_max': size_max}
+                for state, rooms, players, size, size_max in rows}
+
+    async def totals(self):
+        return await self._run(self._totals)
+
+    def _oldest_in_state(self, state, limit):
+        return [row[0] for row in self._db.execute(
+            "SELECT id FROM sessions WHERE json_extract(data, '$.state') = ? "
+            "ORDER BY json_extract(data, '$.created_at') LIMIT ?",
+            (state, limit),
+        )]
+
+    async def oldest_in_state(self, state, limit):
+        return await self._run(self._oldest_in_state, state, limit)
+
+    def _publish(self, session_id, message, to):
+        self._db.execute(
+            "INSERT INTO session_messages (session_id, recipient, payload, created_at) VALUES (?, ?, ?, ?)",
+            (session_id, to, json.dumps(message), time.time()),
+        )
+
+    async def publish(self, session_id, message, to=None):
+        await self._run(self._publish, session_id, message, to)
+
+    async def start_listener(self, callback):
+        last_id = await self._run(
+            lambda: self._db.execute("SELECT COALESCE(MAX(id), 0) FROM session_messages").fetchone()[0])
+        self._listener = asyncio.create_task(self._listen(callback, last_id))
+
+    async def stop_listener(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def _poll(self, last_id):
+        return self._db.execute(
+            "SELECT id, session_id, recipient, payload FROM session_messages WHERE id > ? ORDER BY id",
+            (last_id,),
+        ).fetchall()
+
+    def _prune(self):
+        self._db.execute("DELETE FROM session_messages WHERE created_at < ?", (time.time() - self.message_ttl,))
+
+    async def _listen(self, callback, last_id):
+        last_prune = time.monotonic()
+        while True:
+            for message_id, session_id, recipient, payload in await self._run(self._poll, last_id):
+                last_id = message_id
+                try:
+                    await callback(session_id, json.loads(payload), recipient)
+                except Exception as e:
+                    print(f"Error delivering message {message_id} for session {session_id}: {e}")
+            if time.monotonic() - last_prune > self.message_ttl:
+                last_prune = time.monotonic()
+                await self._run(self._prune)
+            await asyncio.sleep(self.poll_interval)
+
+
+def create_session_store(backend: str = SESSION_STORE) -> SessionStore:
+    """Create the store selected by the SESSION_STORE environment variable ("sqlite" or "memory")."""
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    raise ValueError(f"Unknown session store backend: {backend}")
@@ -0,0 +1,120 @@
+const { mode, sessionId, playerName } = document.body.dataset;
+let ws;
+
+let timeLeft = 120;
+const timer = document.getElementById('timer');
+const form = document.getElementById('gameForm');
+let countdown;
+
+if (mode === "multi") {
+    ws = new WebSocket(`ws://${window.location.host}/ws/${sessionId}`);
+    ws.onopen = () => {
+        console.log("Connected to WebSocket");
+        document.getElementById('chatBox').style.display = 'block';
+    };
+    ws.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (data.type === "round_results") {
+            const resultsDiv = document.createElement('div');
+            resultsDiv.className = 'results';
+            resultsDiv.innerHTML = `<h2>Round Results</h2><p>Round Score: ${data.round_score}</p>`;
+            for (const [category, result] of Object.entries(data.results)) {
+                const p = document.createElement('p');
+                p.className = result.is_valid ? 'correct' : 'incorrect';
+                p.innerHTML = `${category}: "${result.answer || '(blank)'}" - ${result.is_valid ? 'Correct' : 'Incorrect'} (${result.points} points)<span class="explanation"> - ${result.explanation}</span>`;
+                if (!result.is_valid && !result.voted) {
+                    p.innerHTML += ` <button class="vote-button" onclick="vote('${category}')">Vote to Accept</button>`;
+                }
+                resultsDiv.appendChild(p);
+            }
+            resultsDiv.appendChild(nextRoundButton());
+            form.style.display = 'none';
+            document.body.appendChild(resultsDiv);
+            document.getElementById('timer').style.display = 'none';
+            clearInterval(countdown);
+        } else if (data.type === "timer_update") {
+            // The server owns the round clock and resyncs occasionally; count down locally in between
+            timeLeft = data.time_left;
+            timer.textContent = `Time Left: ${timeLeft}`;
+            if (!countdown) {
+                countdown = setInterval(() => {
+                    timeLeft--;
+                    timer.textContent = `Time Left: ${Math.max(timeLeft, 0)}`;
+                    if (timeLeft <= 0) {
+                        clearInterval(countdown);
+                        form.requestSubmit();
+                    }
+                }, 1000);
+            }
+        } else if (data.type === "chat_message") {
+            const messages = document.getElementById('chatMessages');
+            const msg = document.createElement('p');
+            msg.textContent = `${data.player}: ${data.message}`;
+            messages.appendChild(msg);
+            messages.scrollTop = messages.scrollHeight;
+        } else if (data.type === "error" || data.type === "room_ended") {
+            clearInterval(countdown);
+            timer.textContent = data.type === "error" ? data.detail : 'This game has ended';
+            if (data.round_id && !document.querySelector('.results')) {
+                // Answers for a round that had already closed: move on to the one in progress
+                form.style.display = 'none';
+                timer.after(nextRoundButton());
+            }
+        }
+    };
+    form.addEventListener('submit', (event) => {
+        event.preventDefault();
+        const formData = new FormData(form);
+        const answers = {};
+        formData.forEach((value, key) => {
+            if (!['player_name', 'mode', 'session_id', 'letter', 'round_id', 'round_token', 'categories'].includes(key)) answers[key] = value;
+        });
+        // The round ID lets the server drop answers that arrive after their round was closed
+        ws.send(JSON.stringify({ type: "submit_answers", round_id: formData.get('round_id'), answers: answers }));
+    });
+} else {
+    countdown = setInterval(() => {
+        timeLeft--;
+        timer.textContent = `Time Left: ${timeLeft}`;
+        if (timeLeft <= 0) {
+            clearInterval(countdown);
+            alert("Time's up! Submitting answers...");
+            form.submit();
+        }
+    }, 1000);
+}
+
+function nextRoundButton() {
+    const nextBtn = document.createElement('button');
+    nextBtn.textContent = 'Next Round';
+    nextBtn.onclick = () => window.location.href = `/game?mode=multi&player=${encodeURIComponent(playerName)}&session_id=${sessionId}`;
+    return nextBtn;
+}
+
+function vote(category) {
+    if (mode === "multi") {
+        ws.send(JSON.stringify({ type: "vote", category: category }));
+    } else {
+        fetch('/vote', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                category: category,
+                player_name: playerName,
+                mode: mode,
+                session_id: sessionId
+            }),
+        }).then(response => response.json())
+          .then(data => window.location.reload());
+    }
+}
+
+function sendChat() {
+    const input = document.getElementById('chatInput');
+    if (ws && input.value) {
+        ws.send(JSON.stringify({ type: "chat_message", message: input.value }));
+        input.value = '';
+    }
+}
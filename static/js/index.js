@@ -0,0 +1,17 @@
+function startSinglePlayer() {
+    const playerName = document.getElementById('playerName').value;
+    if (!playerName) {
+        alert("Please enter your name!");
+        return;
+    }
+    window.location.href = `/game?mode=single&player=${encodeURIComponent(playerName)}`;
+}
+
+function startMultiplayer() {
+    const playerName = document.getElementById('playerName').value;
+    if (!playerName) {
+        alert("Please enter your name!");
+        return;
+    }
+    window.location.href = `/multiplayer?player=${encodeURIComponent(playerName)}`;
+}
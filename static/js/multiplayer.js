@@ -0,0 +1,33 @@
+const { playerName } = document.body.dataset;
+let sessionId = null;
+
+function startNewGame() {
+    fetch('/game?mode=multi&player=' + encodeURIComponent(playerName), {
+        method: 'GET'
+    })
+    .then(response => response.text())
+    .then(html => {
+        const parser = new DOMParser();
+        const doc = parser.parseFromString(html, 'text/html');
+        const newSessionId = doc.querySelector('input[name="session_id"]').value;
+        sessionId = newSessionId;
+        document.getElementById('sessionCode').textContent = sessionId;
+        window.location.href = `/game?mode=multi&player=${encodeURIComponent(playerName)}&session_id=${newSessionId}`;
+    });
+}
+
+function joinGame() {
+    const sessionCode = prompt("Enter the session code:");
+    if (sessionCode) {
+        window.location.href = `/game?mode=multi&player=${encodeURIComponent(playerName)}&session_id=${sessionCode}`;
+    }
+}
+
+// Display session code if already in a session
+document.addEventListener('DOMContentLoaded', () => {
+    const urlParams = new URLSearchParams(window.location.search);
+    sessionId = urlParams.get('session_id');
+    if (sessionId) {
+        document.getElementById('sessionCode').textContent = sessionId;
+    }
+});
@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# Point the databases, the validator's caches and the round secret at throwaway files before anything imports them
+_workdir = tempfile.mkdtemp(prefix="wordrush-tests-")
+os.environ.setdefault("VERDICT_CACHE_PATH", os.path.join(_workdir, "verdict_cache.db"))
+os.environ.setdefault("LEXICON_INDEX_PATH", os.path.join(_workdir, "lexicon.idx"))
+os.environ.setdefault("LEXICON_LEARNED_PATH", os.path.join(_workdir, "lexicon_learned.tsv"))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(_workdir, "wordrush.db"))
+os.environ.setdefault("ROUND_SECRET_PATH", os.path.join(_workdir, "round_secret"))
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
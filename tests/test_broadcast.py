@@ -0,0 +1,66 @@
+import asyncio
+import json
+from broadcast import Broadcaster, _delta
+from protocol import CompactJSONCodec, V1, expand
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, text):
+        self.frames.append(text)
+
+    async def send_bytes(self, data):
+        self.frames.append(data)
+
+    async def close(self, code=1000):
+        pass
+
+
+def scoreboard(**scores):
+    return {"type": "scoreboard", "scores": {pid: {"name": pid, "score": score} for pid, score in scores.items()}}
+
+
+def test_delta_scoreboard_changes_and_removals():
+    assert _delta(scoreboard(a=10, b=5), scoreboard(a=10, b=5)) is None
+    assert _delta(scoreboard(a=20, b=5), scoreboard(a=10, b=5)) == {
+        "type": "scoreboard", "scores": {"a": {"name": "a", "score": 20}}, "removed": []}
+    assert _delta(scoreboard(a=10), scoreboard(a=10, b=5)) == {"type": "scoreboard", "scores": {}, "removed": ["b"]}
+
+
+def test_delta_timer_only_on_new_deadline():
+    last = {"type": "timer_update", "time_left": 100, "round_deadline": 1000.0}
+    assert _delta({"type": "timer_update", "time_left": 90, "round_deadline": 1000.0}, last) is None
+    update = {"type": "timer_update", "time_left": 120, "round_deadline": 1120.0}
+    assert _delta(update, last) == update
+
+
+def test_send_gives_new_clients_a_full_copy_and_synced_clients_a_delta():
+    codec = CompactJSONCodec()
+
+    async def run():
+        broadcaster = Broadcaster()
+        synced, late, legacy = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        broadcaster.add("room", "synced", synced, codec)
+        broadcaster.add("room", "legacy", legacy, V1)
+        broadcaster.send("room", scoreboard(synced=0, legacy=0))
+        broadcaster.add("room", "late", late, codec)
+        broadcaster.send("room", scoreboard(synced=15, legacy=0, late=0))
+        broadcaster.send("room", scoreboard(synced=15, legacy=0, late=0))
+        await asyncio.sleep(0.01)
+        return broadcaster, synced, late, legacy
+
+    broadcaster, synced, late, legacy = asyncio.run(run())
+    synced_messages = [codec.decode(frame) for frame in synced.frames]
+    assert [set(m["scores"]) for m in synced_messages] == [{"synced", "legacy"}, {"synced", "late"}]
+    assert synced_messages[1]["scores"]["synced"]["score"] == 15
+
+    # Joined after the first scoreboard: gets the whole board, then nothing for the unchanged one
+    late_messages = [expand(json.loads(frame)) for frame in late.frames]
+    assert len(late_messages) == 1
+    assert set(late_messages[0]["scores"]) == {"synced", "legacy", "late"}
+
+    # Version 1 clients always get full copies
+    assert [len(json.loads(frame)["scores"]) for frame in legacy.frames] == [2, 3, 3]
+    assert broadcaster.stats.skipped == 2
@@ -0,0 +1,44 @@
+import asyncio
+import time
+import ai_validator
+from ai_validator import CircuitBreaker
+
+
+def test_opens_after_threshold_and_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    # Only the one trial; everyone else waits for its outcome
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_failed_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+
+def test_open_breaker_accepts_only_words_the_lexicon_knows(monkeypatch):
+    monkeypatch.setattr(ai_validator, "circuit_breaker", CircuitBreaker(failure_threshold=1, reset_timeout=60))
+    ai_validator.circuit_breaker.record_failure()
+
+    verdicts = asyncio.run(ai_validator.validate_pairs_async([
+        ("Types of Fruit", "A", "Apple"), ("Types of Fruit", "A", "applezzz"), ("Animals", "A", "aaaa bbbb"),
+    ]))
+    assert verdicts[("Types of Fruit", "apple")][0]
+    assert not verdicts[("Types of Fruit", "applezzz")][0]
+    assert not verdicts[("Animals", "aaaa bbbb")][0]
+    # Nothing learned or cached from an outage
+    assert ai_validator.verdict_cache.get("Types of Fruit", "applezzz") is None
@@ -0,0 +1,58 @@
+import asyncio
+from ai_validator import Coalescer
+
+
+class FakeGemini:
+    """Stands in for _ask_gemini_async: records each upstream call and judges every word valid."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.calls = []
+
+    async def __call__(self, chunk):
+        self.calls.append(list(chunk))
+        await asyncio.sleep(self.delay)
+        return {(category, word): (True, f"{word} ok") for category, _, word in chunk}
+
+
+def test_concurrent_callers_share_one_upstream_call():
+    ask = FakeGemini()
+    coalescer = Coalescer(ask, window=0.005)
+
+    async def run():
+        return await asyncio.gather(
+            coalescer.validate([("Animals", "A", "zzantelope"), ("Fruits", "A", "zzapple")]),
+            coalescer.validate([("Animals", "A", "zzantelope")]),
+        )
+
+    first, second = asyncio.run(run())
+    assert len(ask.calls) == 1
+    assert sorted(ask.calls[0]) == [("Animals", "A", "zzantelope"), ("Fruits", "A", "zzapple")]
+    assert first[("Animals", "zzantelope")] == second[("Animals", "zzantelope")] == (True, "zzantelope ok")
+    assert coalescer.stats()["joined"] == 1
+    assert coalescer.stats()["in_flight"] == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_pair():
+    ask = FakeGemini(delay=0.05)
+    coalescer = Coalescer(ask, window=0.001)
+
+    async def run():
+        first = asyncio.create_task(coalescer.validate([("Animals", "B", "zzbadger")]))
+        second = asyncio.create_task(coalescer.validate([("Animals", "B", "zzbadger")]))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == {("Animals", "zzbadger"): (True, "zzbadger ok")}
+    assert len(ask.calls) == 1
+
+
+def test_pairs_beyond_max_pairs_are_sent_at_once():
+    ask = FakeGemini()
+    coalescer = Coalescer(ask, window=10, max_pairs=2)
+    pairs = [("Animals", "C", f"zzcat{i}") for i in range(2)]
+
+    verdicts = asyncio.run(asyncio.wait_for(coalescer.validate(pairs), 1))
+    assert len(verdicts) == 2
+    assert len(ask.calls) == 1
@@ -0,0 +1,35 @@
+import multiprocessing
+import os
+import sqlite3
+
+
+def _init_db(url, barrier):
+    os.environ["DATABASE_URL"] = url
+    import database
+    barrier.wait()
+    database.init_db()
+
+
+def test_workers_can_set_up_the_schema_at_the_same_time(tmp_path):
+    path = tmp_path / "wordrush.db"
+    # A database from before created_at and player_stats existed
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE scores (id INTEGER PRIMARY KEY, player_name VARCHAR, score INTEGER)")
+    db.executemany("INSERT INTO scores (player_name, score) VALUES (?, ?)", [("ann", 10), ("ann", 30), ("bob", 15)])
+    db.commit()
+    db.close()
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(4)
+    workers = [context.Process(target=_init_db, args=(f"sqlite:///{path}", barrier)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+    assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+
+    db = sqlite3.connect(path)
+    assert db.execute("SELECT player_name, best, total, games FROM player_stats ORDER BY 1").fetchall() == [
+        ("ann", 30, 40, 2), ("bob", 15, 15, 1)]
+    assert "created_at" in {row[1] for row in db.execute("PRAGMA table_info(scores)")}
+    assert "ix_scores_created_at_score" in {row[1] for row in db.execute("PRAGMA index_list(scores)")}
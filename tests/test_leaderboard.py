@@ -0,0 +1,47 @@
+import pytest
+import leaderboard
+from sqlalchemy.orm import sessionmaker
+from database import Base, create_db_engine
+from leaderboard import Leaderboard
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'wordrush.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def record(board, session_factory, entries):
+    db = session_factory()
+    try:
+        board.record(db, entries)
+    finally:
+        db.close()
+
+
+def test_player_stats_accumulate(session_factory):
+    board = Leaderboard(session_factory)
+    record(board, session_factory, [("ann", 10), ("bob", 5), ("ann", 30)])
+    record(board, session_factory, [("ann", 20)])
+    assert board.player("ann") == {"player_name": "ann", "best": 30, "total": 60, "games": 3}
+    assert [p["player_name"] for p in board.players("total")["players"]] == ["ann", "bob"]
+
+
+def test_cache_is_bounded_and_drops_expired_entries(session_factory, monkeypatch):
+    board = Leaderboard(session_factory, cache_ttl=10, cache_size=3)
+    record(board, session_factory, [("ann", 10)])
+    for name in ("a", "b", "c", "d", "ann"):
+        board.player(name)
+    assert list(board._cache) == [("player", "c"), ("player", "d"), ("player", "ann")]
+
+    monkeypatch.setattr(board, "session_factory", lambda: pytest.fail("cached lookups must not query"))
+    assert board.player("ann")["games"] == 1
+    monkeypatch.setattr(board, "session_factory", session_factory)
+
+    # An expired entry is reloaded and moves to the most recently used end
+    now = leaderboard.time.monotonic()
+    monkeypatch.setattr(leaderboard.time, "monotonic", lambda: now + 11)
+    assert board.player("c") is None
+    assert list(board._cache) == [("player", "d"), ("player", "ann"), ("player", "c")]
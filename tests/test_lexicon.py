@@ -0,0 +1,42 @@
+import pytest
+from lexicon import Lexicon
+
+SEED = [
+    ("Animals", "ant"), ("Animals", "antelope"), ("Animals", "bear"), ("Animals", "zebra"),
+    ("Fruits", "apple"), ("Fruits", "Banana"), ("Types of Dance", "hip  hop"),
+]
+
+
+@pytest.fixture
+def lexicon(tmp_path):
+    seed = tmp_path / "seed.tsv"
+    seed.write_text("# comment\n" + "".join(f"{category}\t{word}\n" for category, word in SEED), encoding="utf-8")
+    lexicon = Lexicon(str(seed), str(tmp_path / "learned.tsv"), str(tmp_path / "lexicon.idx"))
+    yield lexicon
+    lexicon.close()
+
+
+def test_contains_finds_every_entry_and_nothing_else(lexicon):
+    for category, word in SEED:
+        assert lexicon.contains(category, word)
+    assert lexicon.contains("ANIMALS", " Zebra ")
+    assert lexicon.contains("Types of Dance", "hip hop")
+    for category, word in [("Animals", "an"), ("Animals", "ants"), ("Animals", "aardvark"), ("Animals", "zz"),
+                           ("Fruits", "ant"), ("Birds", "bear"), ("", "")]:
+        assert not lexicon.contains(category, word)
+
+
+def test_words_for_reads_one_partition(lexicon):
+    assert lexicon.words_for("Animals", "a") == ["ant", "antelope"]
+    assert lexicon.words_for("Animals", "Z") == ["zebra"]
+    assert lexicon.words_for("Animals", "c") == []
+    assert lexicon.words_for("Fruits", "b") == ["banana"]
+
+
+def test_learn_keeps_valid_answers_for_game_categories_only(lexicon, tmp_path):
+    verdicts = {("Animals", "cat"): (True, ""), ("Animals", "cow"): (False, ""), ("Made Up\tCategory", "x"): (True, "")}
+    assert lexicon.learn(verdicts, ["Animals"]) == 1
+    assert lexicon.contains("Animals", "cat")
+    assert not lexicon.contains("Animals", "cow")
+    assert (tmp_path / "learned.tsv").read_text(encoding="utf-8") == "animals\tcat\n"
+    assert lexicon.learn(verdicts, ["Animals"]) == 0
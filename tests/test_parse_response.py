@@ -0,0 +1,57 @@
+import json
+from ai_validator import _parse_response, _number_pairs
+
+
+def gemini_body(items) -> dict:
+    text = items if isinstance(items, str) else json.dumps(items)
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+PENDING = _number_pairs([("Animals", "D", "dog"), ("Fruits", "D", "date"), ("Countries", "D", "denmark")])
+
+
+def test_all_pairs_answered():
+    verdicts, missing = _parse_response(gemini_body([
+        {"id": "1", "valid": True, "explanation": "A pet."},
+        {"id": "2", "valid": False, "explanation": "Not a fruit"},
+        {"id": "3", "valid": True, "explanation": "A country"},
+    ]), PENDING)
+    assert verdicts == {
+        ("Animals", "dog"): (True, "A pet"),
+        ("Fruits", "date"): (False, "Not a fruit"),
+        ("Countries", "denmark"): (True, "A country"),
+    }
+    assert missing == {}
+
+
+def test_missing_ids_are_returned_for_a_retry():
+    verdicts, missing = _parse_response(gemini_body([{"id": "2", "valid": True, "explanation": "A fruit"}]), PENDING)
+    assert verdicts == {("Fruits", "date"): (True, "A fruit")}
+    assert missing == {"1": PENDING["1"], "3": PENDING["3"]}
+
+
+def test_malformed_and_unknown_ids_are_ignored():
+    verdicts, missing = _parse_response(gemini_body([
+        {"id": "99", "valid": True, "explanation": "Not a pair we sent"},
+        {"valid": True, "explanation": "No ID"},
+        "not an object",
+        {"id": "1", "valid": "maybe", "explanation": "Unusable verdict"},
+        {"id": 3, "valid": "yes"},
+        {"id": "3", "valid": False, "explanation": "Duplicate of an answered pair"},
+    ]), PENDING)
+    assert verdicts == {("Countries", "denmark"): (True, "No explanation given")}
+    assert set(missing) == {"1", "2"}
+
+
+def test_unparseable_body_leaves_every_pair_missing():
+    for body in (gemini_body("Sure! Here are the verdicts"), {"candidates": []}, {}):
+        verdicts, missing = _parse_response(body, PENDING)
+        assert verdicts == {}
+        assert missing == PENDING
+
+
+def test_code_fenced_json_is_accepted():
+    fenced = "```json\n" + json.dumps([{"id": "1", "valid": True, "explanation": "A pet"}]) + "\n```"
+    verdicts, missing = _parse_response(gemini_body(fenced), PENDING)
+    assert verdicts == {("Animals", "dog"): (True, "A pet")}
+    assert set(missing) == {"2", "3"}
@@ -0,0 +1,75 @@
+import asyncio
+import time
+import pytest
+import rooms
+from rooms import RoomManager, RoomError
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore()
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"))
+
+
+def new_round():
+    return {"letter": "A", "categories": ["Animals"], "round_id": "a"}
+
+
+def join(manager, player_id):
+    return lambda room: manager.admit(room, player_id, {"score": 0, "answers": None, "name": player_id})
+
+
+def test_oldest_pending_room_makes_way(store):
+    manager = RoomManager(store, new_round, max_rooms=2, max_pending=2)
+
+    async def run():
+        first = await manager.allocate()
+        second = await manager.allocate()
+        await store.update(second, join(manager, "p1"))
+        third = await manager.allocate()
+        fourth = await manager.allocate()
+        fifth = await manager.allocate()
+        return first, second, third, fourth, fifth, await store.session_ids(), await manager.stats()
+
+    first, second, third, fourth, fifth, ids, stats = asyncio.run(run())
+    # The joined room counts against max_rooms; of the pending ones only the newest two are kept
+    assert set(ids) == {second, fourth, fifth}
+    assert (stats["rooms"], stats["created"], stats["active"], stats["players"]) == (3, 2, 1, 1)
+    assert stats["evicted_displaced"] == 2
+
+
+def test_max_rooms_counts_joined_rooms_only(store):
+    manager = RoomManager(store, new_round, max_rooms=1, max_pending=5)
+
+    async def run():
+        room_id = await manager.allocate()
+        await store.update(room_id, join(manager, "p1"))
+        with pytest.raises(RoomError):
+            await manager.allocate()
+
+    asyncio.run(run())
+    assert manager.rejected == 1
+
+
+def test_sweep_ends_and_deletes_idle_rooms(store, monkeypatch):
+    manager = RoomManager(store, new_round)
+
+    async def run():
+        stale, empty, busy = await manager.allocate(), await manager.allocate(), await manager.allocate()
+        await store.update(empty, lambda room: room.update(state="active"))
+        await store.update(busy, join(manager, "p1"))
+        await store.update(stale, lambda room: room.update(last_active=time.time() - rooms.ROOM_CREATED_TTL - 1))
+        await store.update(empty, lambda room: room.update(last_active=time.time() - rooms.ROOM_EMPTY_TTL - 1))
+        assert await manager.sweep() == 2
+        report = {room["id"]: room for room in await manager.report()}
+        assert set(report) == {empty, busy}
+        assert report[empty]["state"] == "ended" and report[busy]["players"] == 1
+        monkeypatch.setattr(rooms, "ROOM_ENDED_TTL", -1)
+        assert await manager.sweep() == 1
+        return await store.session_ids(), busy
+
+    ids, busy = asyncio.run(run())
+    assert ids == [busy]
+    assert manager.evicted["created"] == manager.evicted["empty"] == 1
@@ -0,0 +1,43 @@
+import pytest
+import game_logic
+from game_logic import round_from_id, round_id_from_seed, round_token, check_round_token
+
+
+def test_round_id_reproduces_the_round():
+    round_id = round_id_from_seed(123456789)
+    assert round_from_id(round_id) == round_from_id(round_id.upper())
+    assert round_from_id(round_id)["round_id"] == round_id
+    for bad in ("", "not a round", "-1", round_id_from_seed(2 ** game_logic.ROUND_SEED_BITS)):
+        with pytest.raises(ValueError):
+            round_from_id(bad)
+
+
+def test_token_is_accepted_for_its_round_only():
+    round_id, other = round_id_from_seed(1), round_id_from_seed(2)
+    token = round_token(round_id)
+    check_round_token(round_id, token)
+    with pytest.raises(ValueError, match="does not match"):
+        check_round_token(other, token)
+
+
+def test_tampered_tokens_are_rejected():
+    round_id = round_id_from_seed(1)
+    issued, _, signature = round_token(round_id).partition(".")
+    flipped = ("0" if signature[0] != "0" else "1") + signature[1:]
+    later = f"{int(issued, 16) + 60:x}"
+    for token in (f"{issued}.{flipped}", f"{later}.{signature}", f"{issued}.", signature, ""):
+        with pytest.raises(ValueError):
+            check_round_token(round_id, token)
+
+
+def test_expired_and_future_tokens_are_rejected(monkeypatch):
+    round_id = round_id_from_seed(1)
+    now = game_logic.time.time()
+    monkeypatch.setattr(game_logic.time, "time", lambda: now - game_logic.ROUND_TOKEN_TTL - 1)
+    expired = round_token(round_id)
+    monkeypatch.setattr(game_logic.time, "time", lambda: now + 60)
+    future = round_token(round_id)
+    monkeypatch.setattr(game_logic.time, "time", lambda: now)
+    for token in (expired, future):
+        with pytest.raises(ValueError, match="expired"):
+            check_round_token(round_id, token)
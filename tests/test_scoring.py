@@ -0,0 +1,31 @@
+import asyncio
+import game_logic
+from game_logic import build_results, calculate_score
+
+ROUND = {"letter": "B", "categories": ["Animals", "Types of Fruit", "Countries", "Sports"], "round_id": "x"}
+VERDICTS = {
+    ("Animals", "bear"): (True, "An animal"),
+    ("Types of Fruit", "banana"): (True, "A fruit"),
+    ("Countries", "banana"): (False, "Not a country"),
+}
+
+
+def test_single_player_results_and_score_agree():
+    answers = {"Animals": "Bear", "Types of Fruit": "banana", "Countries": " Banana", "Sports": ""}
+    results = build_results(answers, ROUND, VERDICTS)
+    assert {category: r["points"] for category, r in results.items()} == {
+        "Animals": 15, "Types of Fruit": 10, "Countries": 0, "Sports": 0}
+    assert results["Sports"]["explanation"] == "No answer provided"
+    assert calculate_score(answers, ROUND, VERDICTS) == 25
+
+
+def test_live_scoring_uses_the_replay_rules(monkeypatch):
+    async def validate_pairs_async(pairs):
+        assert sorted(pairs) == [("Animals", "B", "Bear"), ("Countries", "B", " Banana"), ("Types of Fruit", "B", "banana")]
+        return VERDICTS
+
+    monkeypatch.setattr(game_logic, "validate_pairs_async", validate_pairs_async)
+    answers = {"Animals": "Bear", "Types of Fruit": "banana", "Countries": " Banana"}
+    results, score = asyncio.run(game_logic.score_round(answers, ROUND))
+    assert results == build_results(answers, ROUND, VERDICTS)
+    assert score == calculate_score(answers, ROUND, VERDICTS) == 25
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from rooms import RoomError
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore
+    return lambda: SQLiteSessionStore(str(tmp_path / "sessions.db"), poll_interval=0.01)
+
+
+def test_create_does_not_overwrite_an_existing_room(make_store):
+    store = make_store()
+
+    async def run():
+        assert await store.create("ABCD", {"players": {}, "state": "created"})
+        assert not await store.create("ABCD", {"players": {"x": {}}, "state": "active"})
+        return await store.get("ABCD"), await store.count()
+
+    assert asyncio.run(run()) == ({"players": {}, "state": "created"}, 1)
+
+
+def test_failed_update_is_rolled_back(make_store):
+    store = make_store()
+
+    def join_full_room(room):
+        room["players"]["late"] = {"score": 0}
+        raise RoomError("This game is full")
+
+    async def run():
+        await store.create("ABCD", {"players": {"a": {"score": 0}}, "state": "active"})
+        with pytest.raises(RoomError):
+            await store.update("ABCD", join_full_room)
+        assert await store.update("NONE", join_full_room) is None
+        with pytest.raises(KeyError):
+            await store.delete_if("ABCD", lambda room: room["missing"])
+        return await store.get("ABCD")
+
+    assert asyncio.run(run()) == {"players": {"a": {"score": 0}}, "state": "active"}
+
+
+def test_delete_if_checks_the_current_state(make_store):
+    store = make_store()
+
+    async def run():
+        await store.create("ABCD", {"players": {}, "state": "created"})
+        assert not await store.delete_if("ABCD", lambda room: room["state"] == "active")
+        await store.update("ABCD", lambda room: room.update(state="active"))
+        assert await store.delete_if("ABCD", lambda room: room["state"] == "active")
+        return await store.get("ABCD")
+
+    assert asyncio.run(run()) is None
+
+
+def test_listener_gets_broadcasts_and_private_messages(make_store):
+    store = make_store()
+
+    async def run():
+        received = []
+
+        async def callback(session_id, message, to):
+            received.append((session_id, message, to))
+
+        await store.start_listener(callback)
+        await store.publish("ABCD", {"type": "chat_message", "message": "hi"})
+        await store.publish("ABCD", {"type": "round_results", "round_score": 15}, to="p1")
+        for _ in range(100):
+            if len(received) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await store.stop_listener()
+        return received
+
+    assert asyncio.run(run()) == [
+        ("ABCD", {"type": "chat_message", "message": "hi"}, None),
+        ("ABCD", {"type": "round_results", "round_score": 15}, "p1"),
+    ]
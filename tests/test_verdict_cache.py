@@ -0,0 +1,53 @@
+import asyncio
+import time
+import pytest
+from verdict_cache import VerdictCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "verdicts.db")
+
+
+def test_persistent_tier_is_shared_and_read_off_the_loop(cache_path):
+    writer = VerdictCache(cache_path)
+    reader = VerdictCache(cache_path)
+
+    async def run():
+        await writer.put_many_async({("Animals", " Zebra "): (True, "A striped animal")})
+        return await reader.get_many_async([("animals", "zebra"), ("Animals", "yak")])
+
+    assert asyncio.run(run()) == {("animals", "zebra"): (True, "A striped animal")}
+    assert reader.stats()["persistent_hits"] == 1 and reader.stats()["misses"] == 1
+    # Now in the reader's hot tier
+    assert reader.get("ANIMALS", "zebra") == (True, "A striped animal")
+    assert reader.stats()["hits"] == 1
+
+
+def test_evict_expired_deletes_in_batches(cache_path):
+    cache = VerdictCache(cache_path, ttl=60, max_rows=5, evict_batch=3)
+    cache.put_many({("Animals", f"ant{i}"): (True, "") for i in range(10)})
+    # Age four rows past the TTL
+    cache._call(lambda: cache._db.execute(
+        "UPDATE verdicts SET created_at = created_at - 120 WHERE word IN ('ant0', 'ant1', 'ant2', 'ant3')"))
+
+    assert cache.evict_expired() == 5
+    assert cache._call(lambda: cache._db.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]) == 5
+    assert cache.evict_expired() == 0
+
+
+def test_lookups_are_not_held_up_by_the_database(cache_path):
+    cache = VerdictCache(cache_path)
+    cache.put("Animals", "zebra", True, "")
+    cache._executor.submit(time.sleep, 0.5)
+
+    async def run():
+        start = time.perf_counter()
+        lookup = asyncio.create_task(cache.get_many_async([("Animals", "yak")]))
+        await asyncio.sleep(0.05)
+        # The loop keeps running, and hot-tier hits do not wait for the database thread
+        assert cache.get("Animals", "zebra") == (True, "")
+        assert time.perf_counter() - start < 0.2
+        return await lookup
+
+    assert asyncio.run(run()) == {}
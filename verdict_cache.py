@@ -0,0 +1,268 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+VERDICT_CACHE_PATH = os.getenv("VERDICT_CACHE_PATH", "verdict_cache.db")
+VERDICT_CACHE_SIZE = int(os.getenv("VERDICT_CACHE_SIZE", "20000"))
+VERDICT_CACHE_TTL = int(os.getenv("VERDICT_CACHE_TTL", str(30 * 24 * 3600)))
+VERDICT_CACHE_MAX_ROWS = int(os.getenv("VERDICT_CACHE_MAX_ROWS", "500000"))
+# How often expired and excess persistent entries are deleted
+VERDICT_CACHE_EVICT_INTERVAL = float(os.getenv("VERDICT_CACHE_EVICT_INTERVAL", "3600"))
+# Rows deleted per statement while evicting, so lookups queued behind eviction wait for one batch at most
+VERDICT_CACHE_EVICT_BATCH = int(os.getenv("VERDICT_CACHE_EVICT_BATCH", "5000"))
+
+
+def normalize_key(category: str, word: str) -> tuple[str, str]:
+    """Normalize a (category, word) pair so equivalent answers share one cache entry."""
+    return category.strip().lower(), " ".join(word.strip().lower().split())
+
+
+class VerdictCache:
+    """
+    Two-tier cache of validator verdicts keyed on (category, normalized word).
+    The hot tier is an in-process LRU; the persistent tier is a SQLite table
+    shared by every worker on the host. Entries expire after `ttl` seconds.
+    The SQLite table is only touched from one dedicated thread and the lock
+    only guards the LRU, so a slow statement (eviction, or waiting for another
+    worker's write) never holds up hot-tier lookups. Event-loop callers use
+    the *_async methods; the others block until the database thread is done.
+    """
+
+    def __init__(self, path: str = VERDICT_CACHE_PATH, max_size: int = VERDICT_CACHE_SIZE,
+                 ttl: int = VERDICT_CACHE_TTL, max_rows: int = VERDICT_CACHE_MAX_ROWS,
+                 evict_batch: int = VERDICT_CACHE_EVICT_BATCH):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.evict_batch = evict_batch
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._hot = OrderedDict()  # key -> (is_valid, explanation, expires_at)
+        self._lock = threading.Lock()
+        self._db = None
+        self._executor = None
+        if path:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="verdict-cache")
+            self._call(self._open, path)
+
+    def _open(self, path):
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "category TEXT NOT NULL, word TEXT NOT NULL, is_valid INTEGER NOT NULL, "
+            "explanation TEXT NOT NULL, created_at REAL NOT NULL, "
+            "PRIMARY KEY (category, word))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_verdicts_created_at ON verdicts (created_at)")
+        self._db.commit()
+
+    def _call(self, fn, *args):
+        """Run `fn` on the database thread and wait for it."""
+        return self._executor.submit(fn, *args).result()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _remember(self, key, is_valid, explanation, expires_at):
+        self._hot[key] = (is_valid, explanation, expires_at)
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.max_size:
+            self._hot.popitem(last=False)
+            self.evictions += 1
+
+    def _get_hot(self, pairs, now):
+        """Split pairs into hot-tier hits, keyed as passed in, and misses grouped by normalized key."""
+        found = {}
+        missing = {}
+        with self._lock:
+            for category, word in pairs:
+                key = normalize_key(category, word)
+                entry = self._hot.get(key)
+                if entry and entry[2] > now:
+                    self._hot.move_to_end(key)
+                    found[(category, word)] = (entry[0], entry[1])
+                    self.hits += 1
+                else:
+                    if entry:
+                        del self._hot[key]
+                    missing.setdefault(key, []).append((category, word))
+        return found, missing
+
+    def _load(self, keys, now) -> dict:
+        """Unexpired persistent rows for `keys`, as key -> (is_valid, explanation, expires_at)."""
+        rows = {}
+        for key in keys:
+            row = self._db.execute(
+                "SELECT is_valid, explanation, created_at FROM verdicts WHERE category = ? AND word = ?",
+                key,
+            ).fetchone()
+            if row and row[2] + self.ttl > now:
+                rows[key] = (bool(row[0]), row[1], row[2] + self.ttl)
+        return rows
+
+    def _merge_loaded(self, found, missing, rows):
+        with self._lock:
+            for key, (is_valid, explanation, expires_at) in rows.items():
+                self._remember(key, is_valid, explanation, expires_at)
+                for original in missing.pop(key):
+                    found[original] = (is_valid, explanation)
+                    self.persistent_hits += 1
+            self.misses += sum(len(originals) for originals in missing.values())
+        return found
+
+    def get_many(self, pairs) -> dict[tuple[str, str], tuple[bool, str]]:
+        """
+        Look up (category, word) pairs. Returns a dict keyed by the pairs as
+        passed in, containing only the pairs that were found.
+        """
+        now = time.time()
+        found, missing = self._get_hot(pairs, now)
+        rows = self._call(self._load, list(missing), now) if missing and self._db is not None else {}
+        return self._merge_loaded(found, missing, rows)
+
+    async def get_many_async(self, pairs) -> dict[tuple[str, str], tuple[bool, str]]:
+        """Non-blocking variant of get_many."""
+        now = time.time()
+        found, missing = self._get_hot(pairs, now)
+        rows = await self._run(self._load, list(missing), now) if missing and self._db is not None else {}
+        return self._merge_loaded(found, missing, rows)
+
+    def get(self, category: str, word: str):
+        """Return (is_valid, explanation) for a single pair, or None on a miss."""
+        return self.get_many([(category, word)]).get((category, word))
+
+    def _put_hot(self, verdicts) -> list[tuple]:
+        """Store verdicts in the hot tier; returns the rows for the persistent tier."""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for (category, word), (is_valid, explanation) in verdicts.items():
+                key = normalize_key(category, word)
+                self._remember(key, is_valid, explanation, now + self.ttl)
+                rows.append((key[0], key[1], int(is_valid), explanation, now))
+        return rows
+
+    def _save(self, rows):
+        self._db.executemany("INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?)", rows)
+        self._db.commit()
+
+    def put_many(self, verdicts: dict[tuple[str, str], tuple[bool, str]]):
+        """Store verdicts in both tiers."""
+        rows = self._put_hot(verdicts)
+        if rows and self._db is not None:
+            self._call(self._save, rows)
+
+    async def put_many_async(self, verdicts: dict[tuple[str, str], tuple[bool, str]]):
+        """Non-blocking variant of put_many."""
+        rows = self._put_hot(verdicts)
+        if rows and self._db is not None:
+            await self._run(self._save, rows)
+
+    def put(self, category: str, word: str, is_valid: bool, explanation: str):
+        self.put_many({(category, word): (is_valid, explanation)})
+
+    def _recent(self, cutoff, limit):
+        return self._db.execute(
+            "SELECT category, word, is_valid, explanation, created_at FROM verdicts "
+            "WHERE created_at > ? ORDER BY created_at DESC LIMIT ?",
+            (cutoff, limit),
+        ).fetchall()
+
+    def warm(self, entries=None, limit: int | None = None):
+        """
+        Pre-warm the cache. With `entries` (an iterable of
+        (category, word, is_valid, explanation)) those verdicts are stored;
+        otherwise the most recent persistent entries are loaded into the hot tier.
+        Returns the number of entries loaded.
+        """
+        if entries is not None:
+            verdicts = {(c, w): (bool(v), e) for c, w, v, e in entries}
+            self.put_many(verdicts)
+            return len(verdicts)
+        if self._db is None:
+            return 0
+        rows = self._call(self._recent, time.time() - self.ttl, limit or self.max_size)
+        with self._lock:
+            # Oldest first so the newest entries end up most recently used
+            for category, word, is_valid, explanation, created_at in reversed(rows):
+                self._remember((category, word), bool(is_valid), explanation, created_at + self.ttl)
+        return len(rows)
+
+    def _evict_batch(self, cutoff) -> int:
+        """Delete up to evict_batch expired or excess rows; returns how many were deleted."""
+        deleted = self._db.execute(
+            "DELETE FROM verdicts WHERE rowid IN (SELECT rowid FROM verdicts WHERE created_at <= ? LIMIT ?)",
+            (cutoff, self.evict_batch),
+        ).rowcount
+        if deleted < self.evict_batch:
+            deleted += self._db.execute(
+                "DELETE FROM verdicts WHERE rowid IN ("
+                "SELECT rowid FROM verdicts ORDER BY created_at DESC LIMIT ? OFFSET ?)",
+                (self.evict_batch - deleted, self.max_rows),
+            ).rowcount
+        self._db.commit()
+        return deleted
+
+    def evict_expired(self) -> int:
+        """
+        Drop expired entries from both tiers and trim the persistent tier to
+        `max_rows`. Returns the number of persistent rows deleted. Rows are
+        deleted in batches, each its own job on the database thread, so
+        lookups are not held up for the whole eviction.
+        """
+        now = time.time()
+        with self._lock:
+            for key in [k for k, entry in self._hot.items() if entry[2] <= now]:
+                del self._hot[key]
+                self.evictions += 1
+        if self._db is None:
+            return 0
+        total = 0
+        while True:
+            deleted = self._call(self._evict_batch, now - self.ttl)
+            total += deleted
+            if deleted < self.evict_batch:
+                return total
+
+    def _answer_counts(self, cutoff):
+        return self._db.execute(
+            "SELECT category, substr(word, 1, 1), COUNT(*) FROM verdicts "
+            "WHERE is_valid = 1 AND created_at > ? GROUP BY 1, 2",
+            (cutoff,),
+        ).fetchall()
+
+    def answer_counts(self) -> dict[tuple[str, str], int]:
+        """Number of persisted valid verdicts per (normalized category, first letter)."""
+        if self._db is None:
+            return {}
+        rows = self._call(self._answer_counts, time.time() - self.ttl)
+        return {(category, letter): count for category, letter, count in rows}
+
+    def _clear(self):
+        self._db.execute("DELETE FROM verdicts")
+        self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._hot.clear()
+        if self._db is not None:
+            self._call(self._clear)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "size": len(self._hot),
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.persistent_hits) / lookups if lookups else 0.0,
+        }